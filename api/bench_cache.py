@@ -0,0 +1,123 @@
+"""
+캐시 직렬화 벤치마크
+기존 JSON 텍스트 저장 방식과 CacheCodec(바이너리/msgpack/zstd)의
+Redis 메모리 사용량과 get/set 지연 시간을 비교합니다.
+
+사용법:
+    REDIS_URL=redis://localhost:6379/15 python bench_cache.py [반복 횟수]
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import statistics
+
+import redis.asyncio as redis
+
+from serializers import (
+    CacheCodec, JsonSerializer, MsgpackSerializer, VectorSerializer,
+    MSGPACK_AVAILABLE, ZSTD_AVAILABLE
+)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/15")
+BENCH_PREFIX = "bench"
+
+def sample_embedding(dim: int = 4096):
+    return [random.uniform(-1, 1) for _ in range(dim)]
+
+def sample_context(n_concepts: int = 16, n_relations: int = 80):
+    # 임의 한글 라벨 (반복 패턴이 압축률을 과장하지 않도록)
+    labels = [
+        "".join(chr(random.randint(0xAC00, 0xD7A3)) for _ in range(random.randint(2, 5)))
+        for _ in range(n_concepts * 3)
+    ]
+    return {
+        "concepts": [{"uri": f"/c/ko/{l}", "label": l, "lang": "ko"} for l in labels[:n_concepts]],
+        "relations": [
+            {
+                "start": random.choice(labels), "rel_type": "RelatedTo", "end": random.choice(labels),
+                "weight": random.uniform(0, 5), "start_lang": "ko", "end_lang": "ko",
+                "start_uri": f"/c/ko/{random.choice(labels)}", "end_uri": f"/c/ko/{random.choice(labels)}"
+            }
+            for _ in range(n_relations)
+        ],
+        "neighbors": [{"label": l, "lang": "ko", "uri": f"/c/ko/{l}"} for l in labels],
+        "paths": [],
+        "keywords": ["사랑", "감정"],
+        "search_mode": "hybrid"
+    }
+
+class LegacyJson:
+    """기존 CacheManager 방식 (ensure_ascii=False JSON 텍스트)"""
+    def encode(self, prefix, value):
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, data):
+        return json.loads(data)
+
+def build_codecs():
+    codecs = {"json (legacy)": LegacyJson()}
+    structured = MsgpackSerializer() if MSGPACK_AVAILABLE else JsonSerializer()
+    codecs["binary f32"] = CacheCodec({"embedding": VectorSerializer("float32")}, structured)
+    codecs["binary f16"] = CacheCodec({"embedding": VectorSerializer("float16")}, structured)
+    if ZSTD_AVAILABLE:
+        codecs["binary f32 + zstd"] = CacheCodec(
+            {"embedding": VectorSerializer("float32")}, structured, compress_threshold=2048
+        )
+    return codecs
+
+async def bench(client, codec, prefix, value, n):
+    set_times, get_times, memory = [], [], []
+    for i in range(n):
+        key = f"{BENCH_PREFIX}:{prefix}:{i}"
+
+        t0 = time.perf_counter()
+        await client.set(key, codec.encode(prefix, value))
+        set_times.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        codec.decode(await client.get(key))
+        get_times.append(time.perf_counter() - t0)
+
+        memory.append(await client.memory_usage(key))
+
+    async for key in client.scan_iter(match=f"{BENCH_PREFIX}:*"):
+        await client.unlink(key)
+
+    return {
+        "bytes": int(statistics.mean(memory)),
+        "set_ms": statistics.median(set_times) * 1000,
+        "get_ms": statistics.median(get_times) * 1000
+    }
+
+def float16_cosine_error(trials: int = 200, dim: int = 4096) -> float:
+    """float16 저장 후 복원한 벡터의 코사인 유사도 오차 (최대 절대값)"""
+    codec = VectorSerializer("float16")
+    worst = 0.0
+    for _ in range(trials):
+        a, b = sample_embedding(dim), sample_embedding(dim)
+        a16, b16 = codec.loads(codec.dumps(a)), codec.loads(codec.dumps(b))
+        cos = lambda x, y: sum(p * q for p, q in zip(x, y)) / (sum(p * p for p in x) * sum(q * q for q in y)) ** 0.5
+        worst = max(worst, abs(cos(a, b) - cos(a16, b16)))
+    return worst
+
+async def main(n: int):
+    client = redis.from_url(REDIS_URL, decode_responses=False)
+    await client.ping()
+
+    workloads = {"embedding": sample_embedding(), "search": sample_context()}
+    print(f"Redis: {REDIS_URL}, 반복: {n}, msgpack={MSGPACK_AVAILABLE}, zstd={ZSTD_AVAILABLE}\n")
+    print(f"{'workload':<10} {'codec':<20} {'memory(B)':>10} {'set(ms)':>9} {'get(ms)':>9}")
+    for prefix, value in workloads.items():
+        for name, codec in build_codecs().items():
+            r = await bench(client, codec, prefix, value, n)
+            print(f"{prefix:<10} {name:<20} {r['bytes']:>10} {r['set_ms']:>9.3f} {r['get_ms']:>9.3f}")
+
+    print(f"\nfloat16 코사인 유사도 최대 오차: {float16_cosine_error():.2e}")
+
+    await client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -2,11 +2,15 @@
 Redis 기반 캐싱 시스템
 반복적인 검색 및 LLM 호출 결과를 캐싱하여 응답 속도 향상
 """
-import json
+import os
+import asyncio
 import hashlib
-from typing import Optional, Any
+from collections import defaultdict
+from typing import Optional, Any, Dict, List, Tuple
 from datetime import timedelta
 
+from serializers import CacheCodec
+
 try:
     import redis.asyncio as redis
     REDIS_AVAILABLE = True
@@ -14,35 +18,185 @@ except ImportError:
     REDIS_AVAILABLE = False
     print("⚠️ Redis not available. Caching disabled.")
 
+# 인덱서가 그래프 재빌드 후 INCR 하는 그래프 세대 번호 키
+GRAPH_VERSION_KEY = "graphrag:graph_version"
+# 세대 변경 시 이전 세대 정리를 맡을 워커 한 곳을 정하는 키 (SET NX)
+GRAPH_PURGE_LOCK_KEY = "graphrag:purge"
+
+# 그래프 내용에 의존하는 prefix (키에 세대 번호 포함)
+# 키워드/임베딩은 모델에만 의존하므로(키에 모델명 포함) 재빌드 후에도 유효
+VERSIONED_PREFIXES = {"search", "llm_response", "stats"}
+
 class CacheManager:
-    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
+    def __init__(self, redis_url: str = "redis://localhost:6379/0", codec: Optional[CacheCodec] = None):
         self.redis_url = redis_url
+        self.codec = codec or CacheCodec()
         self.client = None
         self.enabled = REDIS_AVAILABLE
+        # prefix별 히트/미스 카운터 (워밍업 효과 측정용)
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self.generation = 0
+        self._generation_known = False
+        self._generation_listeners = []
+        self._watch_task = None
+        self._background = set()
     
-    async def connect(self):
-        """Redis 연결"""
+    async def connect(self) -> bool:
+        """
+        Redis 연결 (실패 시 client는 None으로 남아 캐시 없이 동작하며, 다시 호출하여 재시도 가능)
+        """
         if not self.enabled:
-            return
+            return False
+        if self.client:
+            return True
         
         try:
-            self.client = await redis.from_url(self.redis_url, encoding="utf-8", decode_responses=True)
-            await self.client.ping()
+            # 바이너리 직렬화를 위해 응답을 디코딩하지 않음
+            client = redis.from_url(self.redis_url, decode_responses=False)
+            await client.ping()
+            self.client = client
             print("✅ Redis cache connected")
+            return True
         except Exception as e:
-            print(f"⚠️ Redis connection failed: {e}. Caching disabled.")
-            self.enabled = False
+            print(f"⚠️ Redis connection failed: {e}. Caching disabled until reconnect.")
+            return False
     
     async def disconnect(self):
         """Redis 연결 종료"""
+        if self._watch_task:
+            self._watch_task.cancel()
+        for task in list(self._background):
+            task.cancel()
         if self.client:
             await self.client.close()
     
     def _make_key(self, prefix: str, data: str) -> str:
-        """캐시 키 생성"""
+        """캐시 키 생성 (그래프 의존 prefix는 세대 번호 포함)"""
         hash_val = hashlib.md5(data.encode()).hexdigest()
+        if prefix in VERSIONED_PREFIXES:
+            return f"{prefix}:v{self.generation}:{hash_val}"
         return f"{prefix}:{hash_val}"
     
+    # ===== 그래프 세대 기반 무효화 =====
+    
+    async def refresh_generation(self):
+        """Redis의 그래프 세대 번호를 읽고, 바뀌었으면 이전 세대 정리를 예약"""
+        if not self.enabled or not self.client:
+            return
+        
+        try:
+            value = await self.client.get(GRAPH_VERSION_KEY)
+            generation = int(value) if value else 0
+        except Exception as e:
+            print(f"Cache generation refresh error: {e}")
+            return
+        
+        if not self._generation_known:
+            # 시작 후 첫 확인은 변경이 아님 (리스너 호출 없음)
+            # 정리는 이 세대를 아직 아무도 정리하지 않았을 때만 (중단 중 재빌드된 경우)
+            self.generation = generation
+            self._generation_known = True
+            if generation and await self._claim_purge(generation):
+                self.run_in_background(self.purge_stale_generations())
+            return
+        
+        if generation != self.generation:
+            print(f"♻️ Graph version changed: v{self.generation} -> v{generation}")
+            self.generation = generation
+            if await self._claim_purge(generation):
+                self.run_in_background(self.purge_stale_generations())
+            for listener in self._generation_listeners:
+                try:
+                    listener(generation)
+                except Exception as e:
+                    print(f"Generation listener error: {e}")
+    
+    async def _claim_purge(self, generation: int) -> bool:
+        """이 세대의 이전 세대 정리를 맡을 워커로 선정되었는지 (워커마다 SCAN 반복 방지)"""
+        # 가장 긴 세대 의존 TTL이 지나면 이전 세대 키는 어차피 만료됨
+        try:
+            return bool(await self.client.set(
+                f"{GRAPH_PURGE_LOCK_KEY}:v{generation}", "1", nx=True, ex=CACHE_TTL["llm_response"]
+            ))
+        except Exception as e:
+            print(f"Cache purge lock error: {e}")
+            return False
+    
+    def add_generation_listener(self, listener):
+        """그래프 세대 변경 시 호출할 콜백 등록 (예: 그래프 스냅샷 다시 매핑)"""
+        self._generation_listeners.append(listener)
+    
+    async def bump_generation(self) -> int:
+        """그래프 세대 번호 증가 (한 번의 쓰기로 그래프 의존 캐시 전체 무효화)"""
+        if not self.enabled or not self.client:
+            return self.generation
+        
+        await self.client.incr(GRAPH_VERSION_KEY)
+        await self.refresh_generation()
+        return self.generation
+    
+    def start_generation_watch(self, interval: float = 10.0):
+        """주기적으로 세대 번호를 확인하는 백그라운드 태스크 시작"""
+        async def _watch():
+            while True:
+                await self.refresh_generation()
+                await asyncio.sleep(interval)
+        
+        if self.enabled and self.client and not self._watch_task:
+            self._watch_task = asyncio.create_task(_watch())
+    
+    def run_in_background(self, coro):
+        """요청 처리와 무관한 정리 작업을 백그라운드로 실행"""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+    
+    async def _unlink_matching(self, pattern: str, keep=None, batch_size: int = 500) -> int:
+        """SCAN 결과를 배치로 모아 파이프라인 UNLINK (keep(key)가 True인 키는 유지)"""
+        removed = 0
+        batch = []
+        async for key in self.client.scan_iter(match=pattern, count=batch_size):
+            if keep and keep(key):
+                continue
+            batch.append(key)
+            if len(batch) >= batch_size:
+                removed += await self._unlink_batch(batch)
+                batch = []
+        if batch:
+            removed += await self._unlink_batch(batch)
+        return removed
+    
+    async def _unlink_batch(self, keys) -> int:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.unlink(key)
+            results = await pipe.execute()
+        return sum(results)
+    
+    async def purge_stale_generations(self, prefix: Optional[str] = None) -> int:
+        """
+        현재 세대가 아닌 키 일괄 삭제 (TTL 만료 전 메모리 회수용)
+        prefix가 없으면 세대 의존 prefix 전체를 SCAN 한 번으로 정리
+        """
+        if not self.enabled or not self.client:
+            return 0
+        
+        prefixes = [prefix] if prefix else sorted(VERSIONED_PREFIXES)
+        versioned = tuple(f"{p}:v".encode() for p in prefixes)
+        current = tuple(f"{p}:v{self.generation}:".encode() for p in prefixes)
+        try:
+            removed = await self._unlink_matching(
+                f"{prefix}:v*" if prefix else "*:v*",
+                keep=lambda key: not key.startswith(versioned) or key.startswith(current)
+            )
+            if removed:
+                print(f"🧹 Purged {removed} stale cache entries ({', '.join(prefixes)})")
+            return removed
+        except Exception as e:
+            print(f"Cache purge error: {e}")
+            return 0
+    
     async def get(self, prefix: str, key_data: str) -> Optional[Any]:
         """캐시 조회"""
         if not self.enabled or not self.client:
@@ -53,9 +207,13 @@ class CacheManager:
             value = await self.client.get(cache_key)
             
             if value:
-                return json.loads(value)
+                decoded = self.codec.decode(value)
+                self.stats[prefix]["hits"] += 1
+                return decoded
+            self.stats[prefix]["misses"] += 1
             return None
         except Exception as e:
+            self.stats[prefix]["misses"] += 1
             print(f"Cache get error: {e}")
             return None
     
@@ -72,11 +230,54 @@ class CacheManager:
         
         try:
             cache_key = self._make_key(prefix, key_data)
-            value_json = json.dumps(value, ensure_ascii=False)
-            await self.client.setex(cache_key, ttl, value_json)
+            await self.client.setex(cache_key, ttl, self.codec.encode(prefix, value))
         except Exception as e:
             print(f"Cache set error: {e}")
     
+    async def mget_many(self, prefix: str, key_datas: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        여러 키를 MGET 한 번으로 조회
+        
+        Returns:
+            (hits, misses): {key_data: value}와 캐시에 없는 key_data 리스트 (중복 제거, 순서 유지)
+        """
+        unique = list(dict.fromkeys(key_datas))
+        if not self.enabled or not self.client or not unique:
+            return {}, unique
+        
+        try:
+            values = await self.client.mget([self._make_key(prefix, d) for d in unique])
+        except Exception as e:
+            print(f"Cache mget error: {e}")
+            return {}, unique
+        
+        hits, misses = {}, []
+        for key_data, value in zip(unique, values):
+            if value:
+                try:
+                    hits[key_data] = self.codec.decode(value)
+                    continue
+                except Exception as e:
+                    # 손상되었거나 이 프로세스가 풀 수 없는 값(예: zstandard 미설치)은 미스로 처리
+                    print(f"Cache decode error ({prefix}): {e}")
+            misses.append(key_data)
+        self.stats[prefix]["hits"] += len(hits)
+        self.stats[prefix]["misses"] += len(misses)
+        return hits, misses
+    
+    async def set_many(self, prefix: str, items: Dict[str, Any], ttl: int = 3600):
+        """여러 값을 파이프라인 SETEX로 한 번에 저장"""
+        if not self.enabled or not self.client or not items:
+            return
+        
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key_data, value in items.items():
+                    pipe.setex(self._make_key(prefix, key_data), ttl, self.codec.encode(prefix, value))
+                await pipe.execute()
+        except Exception as e:
+            print(f"Cache set_many error: {e}")
+    
     async def delete(self, prefix: str, key_data: str):
         """캐시 삭제"""
         if not self.enabled or not self.client:
@@ -89,24 +290,38 @@ class CacheManager:
             print(f"Cache delete error: {e}")
     
     async def clear_prefix(self, prefix: str):
-        """특정 prefix의 모든 캐시 삭제"""
+        """특정 prefix의 모든 캐시 삭제 (파이프라인 UNLINK)"""
         if not self.enabled or not self.client:
             return
         
         try:
-            pattern = f"{prefix}:*"
-            async for key in self.client.scan_iter(match=pattern):
-                await self.client.delete(key)
+            await self._unlink_matching(f"{prefix}:*")
         except Exception as e:
             print(f"Cache clear error: {e}")
 
+    def hit_rates(self) -> Dict[str, Dict]:
+        """prefix별 히트율 통계"""
+        report = {}
+        for prefix, counts in self.stats.items():
+            total = counts["hits"] + counts["misses"]
+            report[prefix] = {
+                **counts,
+                "hit_rate": round(counts["hits"] / total, 4) if total else None
+            }
+        return report
+    
+    def reset_stats(self):
+        """히트/미스 카운터 초기화"""
+        self.stats.clear()
+
 # 글로벌 캐시 매니저 인스턴스
-cache = CacheManager()
+cache = CacheManager(os.getenv("REDIS_URL", "redis://localhost:6379/0"), codec=CacheCodec.from_env())
 
 # 캐시 TTL 설정
 CACHE_TTL = {
     "search": 3600,      # 검색 결과: 1시간
     "llm_response": 7200,  # LLM 응답: 2시간
     "embedding": 86400,   # 임베딩: 24시간
+    "keywords": 86400,    # 키워드 추출: 24시간
     "stats": 300          # 통계: 5분
 }
@@ -0,0 +1,187 @@
+"""
+캐시 워밍업 모듈
+배포 직후나 Redis 초기화 후 콜드 캐시로 인한 지연을 줄이기 위해
+질의 로그의 상위 질문/키워드를 미리 재생하여 캐시를 채웁니다.
+"""
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional
+
+from cache_manager import CacheManager
+from query_log import QueryLog
+
+# 여러 워커 중 하나만 워밍업하도록 Redis에 두는 조정 키 ("running" → "done")
+WARMUP_LOCK_KEY = "graphrag:warmup"
+# "running" 키 TTL (담당 워커가 주기적으로 연장, 워커가 죽으면 이 시간 안에 만료)
+WARMUP_HEARTBEAT_TTL = 15
+
+class CacheWarmer:
+    def __init__(
+        self,
+        query_log: QueryLog,
+        cache: CacheManager,
+        replay_query: Callable[[Dict], Awaitable[Optional[bool]]],
+        warm_keyword: Callable[[str], Awaitable[Optional[bool]]],
+        top_n: int = 50,
+        qps: float = 2.0,
+        max_duration: float = 120.0,
+        done_ttl: int = 900
+    ):
+        """
+        Args:
+            replay_query: 로그 항목 하나를 재생하는 코루틴 (검색/답변 캐시 채움, False 반환 시 생략으로 집계)
+            warm_keyword: 키워드 하나로 후보 개념 임베딩을 채우는 코루틴 (False 반환 시 생략으로 집계)
+            top_n: 재생할 상위 질문/키워드 수
+            qps: 초당 최대 재생 수 (실시간 트래픽 보호용)
+            max_duration: 워밍업 전체 제한 시간 (초) - 넘으면 남은 항목을 건너뛰고 partial로 종료
+            done_ttl: 완료 표시 유지 시간 (초) - 이 시간 안에 재시작한 워커는 워밍업 생략
+        """
+        self.query_log = query_log
+        self.cache = cache
+        self.replay_query = replay_query
+        self.warm_keyword = warm_keyword
+        self.top_n = top_n
+        self.min_interval = 1.0 / qps if qps > 0 else 0.0
+        self.max_duration = max_duration
+        self.done_ttl = done_ttl
+        self.state = "pending"  # pending / running / done / partial / skipped / failed
+        self.report: Dict = {}
+        self._last_start = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """워밍업이 끝났는지 (헬스체크 ready 판단용)"""
+        return self.state in ("done", "partial", "skipped", "failed")
+
+    def skip(self, reason: str):
+        """워밍업 없이 완료 처리 (의존 서비스가 준비되지 않은 경우 등)"""
+        self.state = "skipped"
+        self.report = {"state": "skipped", "reason": reason}
+        print(f"⏭️ Cache warm-up skipped: {reason}")
+
+    async def _throttle(self):
+        """최소 간격을 지켜 실시간 요청이 밀리지 않도록 함"""
+        wait = self._last_start + self.min_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_start = time.monotonic()
+
+    async def _claim(self) -> bool:
+        """워밍업 담당 워커로 선정되었는지 (Redis SET NX)"""
+        return bool(await self.cache.client.set(WARMUP_LOCK_KEY, "running", nx=True, ex=WARMUP_HEARTBEAT_TTL))
+
+    async def _heartbeat(self, stop: asyncio.Event):
+        """워밍업하는 동안 "running" 키 TTL 연장 (stop 설정 시 종료)"""
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=WARMUP_HEARTBEAT_TTL / 3)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.cache.client.set(WARMUP_LOCK_KEY, "running", xx=True, ex=WARMUP_HEARTBEAT_TTL)
+            except Exception as e:
+                print(f"⚠️ Warm-up heartbeat failed: {e}")
+
+    async def _wait_for_peer(self) -> bool:
+        """
+        다른 워커의 워밍업이 끝날 때까지 대기 (끝났으면 True)
+        담당 워커가 죽으면 하트비트가 끊겨 키가 곧 만료되며(False), 대기 시간도 워밍업 제한 시간으로 제한
+        """
+        deadline = time.monotonic() + self.max_duration + WARMUP_HEARTBEAT_TTL
+        while True:
+            value = await self.cache.client.get(WARMUP_LOCK_KEY)
+            if value != b"running":
+                return value == b"done"
+            if time.monotonic() >= deadline:
+                print("⚠️ Warm-up by another worker did not finish in time. Reporting ready without it.")
+                return True
+            await asyncio.sleep(1)
+
+    async def run(self):
+        """상위 질문과 키워드를 재생하여 캐시 채우기"""
+        if not self.cache.enabled or not self.cache.client or self.top_n <= 0:
+            self.state = "skipped"
+            return
+
+        # 캐시는 워커 간 공유되므로 한 워커만 재생하고 나머지는 완료를 기다림
+        try:
+            claimed = await self._claim()
+        except Exception as e:
+            print(f"⚠️ Warm-up lock failed: {e}")
+            claimed = True
+        if not claimed:
+            self.state = "running"
+            try:
+                finished = await self._wait_for_peer()
+                # 담당 워커가 도중에 죽어 키가 만료됨: 이어서 담당
+                claimed = not finished and await self._claim()
+            except Exception as e:
+                print(f"⚠️ Warm-up wait failed: {e}")
+            if not claimed:
+                self.state = "done"
+                self.report = {"state": "done", "by_peer": True}
+                return
+
+        self.state = "running"
+        heartbeat_stop = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(heartbeat_stop))
+        started = time.monotonic()
+        deadline = started + self.max_duration
+        counts = {"queries": 0, "keywords": 0, "skipped": 0, "failed": 0}
+
+        try:
+            # 파일 읽기/집계는 이벤트 루프 밖에서 한 번만
+            queries, keywords = await asyncio.to_thread(self.query_log.summarize, self.top_n)
+            print(f"🔥 Cache warm-up: {len(queries)} queries, {len(keywords)} keywords "
+                  f"(max {self.max_duration:.0f}s)")
+
+            jobs = [("queries", entry["query"], self.replay_query, entry) for entry in queries]
+            jobs += [("keywords", kw, self.warm_keyword, kw) for kw in keywords]
+            self.state = "done"
+            for kind, label, replay, arg in jobs:
+                await self._throttle()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.state = "partial"
+                    break
+                try:
+                    # 항목 하나가 느린 의존 서비스에 묶여 전체 제한 시간을 넘기지 않도록
+                    result = await asyncio.wait_for(replay(arg), timeout=remaining)
+                    counts["skipped" if result is False else kind] += 1
+                except asyncio.TimeoutError:
+                    self.state = "partial"
+                    break
+                except Exception as e:
+                    counts["failed"] += 1
+                    print(f"⚠️ Warm-up {kind} failed ({label!r}): {e}")
+
+            if self.state == "partial":
+                print(f"⏱️ Cache warm-up time limit reached ({self.max_duration:.0f}s)")
+        except asyncio.CancelledError:
+            self.state = "failed"
+            raise
+        except Exception as e:
+            self.state = "failed"
+            print(f"⚠️ Cache warm-up aborted: {e}")
+        finally:
+            # 마지막 연장이 "done" 표시를 덮어쓰지 않도록 하트비트 종료를 기다림
+            heartbeat_stop.set()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            self.report = {
+                "state": self.state,
+                "queries_replayed": counts["queries"],
+                "keywords_warmed": counts["keywords"],
+                "skipped": counts["skipped"],
+                "failed": counts["failed"],
+                "duration_sec": round(time.monotonic() - started, 2),
+                # 워밍업 중 캐시 통계 (재실행 시 이미 캐시된 비율)
+                "warmup_cache_stats": self.cache.hit_rates()
+            }
+            # 이후 히트율은 실제 트래픽 기준으로 다시 집계
+            self.cache.reset_stats()
+            try:
+                await self.cache.client.set(WARMUP_LOCK_KEY, "done", ex=self.done_ttl)
+            except Exception:
+                pass
+            print(f"✅ Cache warm-up {self.state}: {self.report}")
@@ -2,19 +2,21 @@
 임베딩 기반 의미 검색 모듈
 Ollama를 활용하여 질문의 의미를 이해하고 유사한 개념을 찾습니다.
 """
-import requests
-import numpy as np
-from typing import List, Dict, Tuple
+import asyncio
+from typing import List, Dict, Tuple, Optional
+
+from http_client import PooledHttpClient, ollama_http
 
 class EmbeddingSearcher:
-    def __init__(self, ollama_url: str, model: str = "mistral"):
+    def __init__(self, ollama_url: str, model: str = "mistral", http: Optional[PooledHttpClient] = None):
         self.ollama_url = ollama_url
         self.model = model
+        self.http = http or ollama_http
     
     def get_embedding(self, text: str) -> List[float]:
         """텍스트의 임베딩 벡터 생성"""
         try:
-            resp = requests.post(
+            resp = self.http.post(
                 f"{self.ollama_url}/api/embeddings",
                 json={"model": self.model, "prompt": text},
                 timeout=30
@@ -25,11 +27,34 @@ class EmbeddingSearcher:
             print(f"임베딩 생성 실패: {e}")
             return []
     
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트의 임베딩 생성 (실패한 항목은 빈 리스트)"""
+        return [self.get_embedding(t) for t in texts]
+    
+    async def get_embeddings_cached(self, texts: List[str], cache, ttl: int) -> List[List[float]]:
+        """
+        캐시 우선 임베딩 조회
+        MGET 한 번으로 히트를 가져오고, 미스만 Ollama에서 생성한 뒤 파이프라인으로 채워 넣습니다.
+        """
+        # 모델이 바뀌면 임베딩 차원이 달라지므로 키에 모델명 포함
+        keys = {t: f"{self.model}|{t}" for t in texts}
+        hits, misses = await cache.mget_many("embedding", list(keys.values()))
+        if misses:
+            missing = [key.split("|", 1)[1] for key in misses]
+            fetched = await asyncio.to_thread(self.get_embeddings, missing)
+            # 실패한 결과(빈 리스트)는 캐싱하지 않음
+            backfill = {keys[t]: emb for t, emb in zip(missing, fetched) if emb}
+            await cache.set_many("embedding", backfill, ttl)
+            hits.update(backfill)
+        return [hits.get(keys[t], []) for t in texts]
+    
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """코사인 유사도 계산"""
         if not vec1 or not vec2:
             return 0.0
         
+        import numpy as np  # 시작 시간 단축을 위해 첫 사용 시 로드
+        
         a = np.array(vec1)
         b = np.array(vec2)
         
@@ -42,7 +67,16 @@ class EmbeddingSearcher:
         return float(np.dot(a, b) / (norm_a * norm_b))
     
     def extract_keywords(self, query: str) -> List[str]:
-        """LLM을 사용하여 핵심 키워드 추출"""
+        """LLM을 사용하여 핵심 키워드 추출 (실패 시 공백 분리 폴백)"""
+        return self.extract_keywords_checked(query)[0]
+    
+    def extract_keywords_checked(self, query: str) -> Tuple[List[str], bool]:
+        """
+        LLM을 사용하여 핵심 키워드 추출
+        
+        Returns:
+            (keywords, ok): ok가 False면 LLM 실패로 공백 분리 폴백을 사용한 것 (캐싱하지 않아야 함)
+        """
         prompt = f"""다음 질문에서 핵심 개념 키워드를 추출하세요. 
 질문: {query}
 
@@ -52,7 +86,7 @@ class EmbeddingSearcher:
 키워드:"""
         
         try:
-            resp = requests.post(
+            resp = self.http.post(
                 f"{self.ollama_url}/api/generate",
                 json={"model": self.model, "prompt": prompt, "stream": False},
                 timeout=30
@@ -64,42 +98,27 @@ class EmbeddingSearcher:
             keywords = [k.strip() for k in keywords_text.split(',')]
             keywords = [k for k in keywords if k and len(k) > 1]
             
-            return keywords[:5]  # 최대 5개
+            return keywords[:5], True  # 최대 5개
         except Exception as e:
             print(f"키워드 추출 실패: {e}")
             # 폴백: 단순 공백 분리
-            return [w for w in query.split() if len(w) > 1][:3]
+            return [w for w in query.split() if len(w) > 1][:3], False
     
-    def search_with_embedding(
-        self, 
-        graph, 
-        query: str, 
-        k: int = 8
-    ) -> Tuple[List[Dict], List[str]]:
-        """
-        임베딩 기반 개념 검색
-        
-        Returns:
-            (concepts, keywords): 찾은 개념 리스트와 사용된 키워드
-        """
-        # 1. 키워드 추출
-        keywords = self.extract_keywords(query)
-        print(f"🔍 추출된 키워드: {keywords}")
-        
-        # 2. 각 키워드로 개념 검색
+    def find_candidates(self, graph, keywords: List[str], k: int = 8) -> List[Dict]:
+        """키워드별 한국어 개념 검색 + 1-hop 연관 개념 수집"""
         all_concepts = []
         seen_uris = set()
         
         for keyword in keywords:
             # 한국어 개념 우선 검색
-            concepts = graph.run("""
+            concepts = graph.read("""
                 MATCH (c:Concept)
                 WHERE c.language = 'ko' 
                   AND (toLower(c.label) CONTAINS toLower($kw)
                        OR toLower(c.label) = toLower($kw))
                 RETURN c.uri as uri, c.label as label, c.language as lang
                 LIMIT $k
-                """, kw=keyword, k=k).data()
+                """, kw=keyword, k=k)
             
             for c in concepts:
                 if c['uri'] not in seen_uris:
@@ -109,31 +128,63 @@ class EmbeddingSearcher:
             # 연관 개념도 탐색 (1-hop)
             if concepts:
                 uris = [c['uri'] for c in concepts]
-                related = graph.run("""
+                related = graph.read("""
                     MATCH (c1:Concept)-[:RELATED]-(c2:Concept)
                     WHERE c1.uri IN $uris AND c2 <> c1
                     RETURN DISTINCT c2.uri as uri, c2.label as label, c2.language as lang
                     LIMIT $k
-                    """, uris=uris, k=k).data()
+                    """, uris=uris, k=k)
                 
                 for c in related:
                     if c['uri'] not in seen_uris:
                         all_concepts.append(c)
                         seen_uris.add(c['uri'])
         
+        return all_concepts
+    
+    def needs_rerank(self, concepts: List[Dict], k: int) -> bool:
+        """재순위화 필요 여부 (시간이 오래 걸리므로 개념이 많을 때만 사용)"""
+        return len(concepts) > k * 2
+    
+    def rerank(
+        self, 
+        query_emb: List[float], 
+        concepts: List[Dict], 
+        label_embs: List[List[float]], 
+        k: int
+    ) -> List[Dict]:
+        """질문 임베딩과 개념 라벨 임베딩의 유사도 순으로 정렬"""
+        concept_scores = [
+            (c, self.cosine_similarity(query_emb, emb))
+            for c, emb in zip(concepts, label_embs)
+        ]
+        concept_scores.sort(key=lambda x: x[1], reverse=True)
+        return [c for c, _ in concept_scores[:k*2]]
+    
+    def search_with_embedding(
+        self, 
+        graph, 
+        query: str, 
+        k: int = 8
+    ) -> Tuple[List[Dict], List[str]]:
+        """
+        임베딩 기반 개념 검색
+        
+        Returns:
+            (concepts, keywords): 찾은 개념 리스트와 사용된 키워드
+        """
+        # 1. 키워드 추출
+        keywords = self.extract_keywords(query)
+        print(f"🔍 추출된 키워드: {keywords}")
+        
+        # 2. 각 키워드로 개념 검색
+        all_concepts = self.find_candidates(graph, keywords, k)
+        
         # 3. 임베딩 기반 재순위화 (옵션)
-        # 시간이 오래 걸리므로 개념이 많을 때만 사용
-        if len(all_concepts) > k * 2:
+        if self.needs_rerank(all_concepts, k):
             query_emb = self.get_embedding(query)
             if query_emb:
-                concept_scores = []
-                for c in all_concepts:
-                    label_emb = self.get_embedding(c['label'])
-                    similarity = self.cosine_similarity(query_emb, label_emb)
-                    concept_scores.append((c, similarity))
-                
-                # 유사도 순으로 정렬
-                concept_scores.sort(key=lambda x: x[1], reverse=True)
-                all_concepts = [c for c, _ in concept_scores[:k*2]]
+                label_embs = [self.get_embedding(c['label']) for c in all_concepts]
+                all_concepts = self.rerank(query_emb, all_concepts, label_embs, k)
         
         return all_concepts[:k*2], keywords
@@ -0,0 +1,118 @@
+"""
+핵심 개념 간 경로 탐색 모듈
+상위 k개 핵심 개념의 모든 쌍에 대해, 로컬 서브그래프에서 다중 출발점 BFS를
+한 번에(출발점 × 노드 배열로) 수행하여 최단 홉 경로를 찾습니다.
+같은 홉 수의 경로가 여러 개면 관계 가중치 합이 큰 경로를 고릅니다.
+"""
+import time
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from graph_ranking import LocalSubgraph
+
+def _path_dict(subgraph: LocalSubgraph, edge_ids: List[int], start: int) -> Dict:
+    """엣지 인덱스 목록 → {"node_labels", "rel_types"} (start 노드부터 순서대로)"""
+    node_labels = [subgraph.node(start)["label"]]
+    rel_types = []
+    current = start
+    for e in edge_ids:
+        s, d = int(subgraph.src[e]), int(subgraph.dst[e])
+        current = d if s == current else s
+        node_labels.append(subgraph.node(current)["label"])
+        rel_types.append(subgraph.edges[e]["rel_type"])
+    return {"node_labels": node_labels, "rel_types": rel_types}
+
+def find_pair_paths(
+    subgraph: LocalSubgraph,
+    uris: List[str],
+    max_hops: int = 3,
+    deadline: Optional[float] = None
+) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+    """
+    uris의 모든 쌍 (i < j) 사이 경로 탐색
+
+    Args:
+        max_hops: 경로 최대 길이
+        deadline: time.monotonic() 기준 마감 시각 (넘으면 찾은 경로까지만 반환)
+
+    Returns:
+        (paths, unresolved): 찾은 경로와 서브그래프 안에서 찾지 못한 uri 쌍
+    """
+    pairs = list(combinations(uris, 2))
+    present = [u for u in uris[:-1] if u in subgraph.index]
+    n = subgraph.num_nodes
+    m = len(subgraph.edges)
+    if not present or m == 0:
+        return [], pairs
+
+    sources = np.asarray([subgraph.index[u] for u in present], dtype=np.int64)
+    k = len(sources)
+
+    # 무방향 엣지: 앞 m개는 src→dst, 뒤 m개는 dst→src (엣지 인덱스는 e % m)
+    frm = np.concatenate([subgraph.src, subgraph.dst])
+    to = np.concatenate([subgraph.dst, subgraph.src])
+    w = np.concatenate([subgraph.weight, subgraph.weight])
+
+    rows = np.arange(k)
+    dist = np.full((k, n), -1, dtype=np.int64)
+    score = np.zeros((k, n))
+    parent = np.full((k, n), -1, dtype=np.int64)  # 도착 엣지 (방향 포함 인덱스)
+    dist[rows, sources] = 0
+    frontier = np.zeros((k, n), dtype=bool)
+    frontier[rows, sources] = True
+
+    target_idx = np.asarray([subgraph.index.get(u, -1) for u in uris], dtype=np.int64)
+
+    for hop in range(1, max_hops + 1):
+        if deadline is not None and time.monotonic() > deadline:
+            break
+
+        # (출발점, 방향 엣지) 중 프런티어에서 나가 미방문 노드로 들어가는 것
+        cand_src, cand_edge = np.nonzero(frontier[:, frm] & (dist[:, to] < 0))
+        if len(cand_src) == 0:
+            break
+
+        cand_to = to[cand_edge]
+        cand_score = score[cand_src, frm[cand_edge]] + w[cand_edge]
+        # (출발점, 도착 노드)별로 가중치 합이 가장 큰 후보 하나만 채택
+        key = cand_src * n + cand_to
+        order = np.lexsort((cand_score, key))
+        key_sorted = key[order]
+        last = np.r_[key_sorted[1:] != key_sorted[:-1], True]
+        best = order[last]
+
+        bs, bv, be = cand_src[best], cand_to[best], cand_edge[best]
+        dist[bs, bv] = hop
+        score[bs, bv] = cand_score[best]
+        parent[bs, bv] = be
+        frontier[:] = False
+        frontier[bs, bv] = True
+
+        # 출발점 이후의 모든 대상이 도달되었으면 조기 종료
+        done = True
+        for i, s in enumerate(present):
+            later = target_idx[uris.index(s) + 1:]
+            later = later[later >= 0]
+            if (dist[i, later] < 0).any():
+                done = False
+                break
+        if done:
+            break
+
+    paths, unresolved = [], []
+    row_of = {u: i for i, u in enumerate(present)}
+    for u1, u2 in pairs:
+        i = row_of.get(u1)
+        v = subgraph.index.get(u2)
+        if i is None or v is None or dist[i, v] < 0:
+            unresolved.append((u1, u2))
+            continue
+        edge_ids = []
+        while v != sources[i]:
+            e = parent[i, v]
+            edge_ids.append(int(e % m))
+            v = frm[e]
+        paths.append(_path_dict(subgraph, edge_ids[::-1], int(sources[i])))
+    return paths, unresolved
@@ -0,0 +1,149 @@
+"""
+그래프 기반 개념 순위화 모듈
+검색된 개념 주변의 로컬 서브그래프에서 키워드 매칭 개념을 시드로 하는
+Personalized PageRank(재시작 랜덤 워크)를 계산하여,
+프롬프트에 넣을 개념/관계/이웃 개념을 그래프 구조에 맞게 선택합니다.
+"""
+from typing import Dict, List, Iterable, Tuple
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+class LocalSubgraph:
+    """Cypher로 가져온 관계 행들로 구성한 무방향 가중 서브그래프"""
+
+    def __init__(self, edges: List[Dict]):
+        """
+        Args:
+            edges: start_uri, start, start_lang, rel_type, weight, end_uri, end, end_lang 키를 가진 관계 행
+        """
+        self.edges = edges
+        m = len(edges)
+
+        # 엣지 단위 Python 루프 없이 C 수준 내장 함수로 노드 인덱싱
+        uris = [e["start_uri"] for e in edges] + [e["end_uri"] for e in edges]
+        labels = [e["start"] for e in edges] + [e["end"] for e in edges]
+        langs = [e["start_lang"] for e in edges] + [e["end_lang"] for e in edges]
+
+        self.uris: List[str] = list(dict.fromkeys(uris))
+        self.index: Dict[str, int] = {u: i for i, u in enumerate(self.uris)}
+        self._info = dict(zip(uris, zip(labels, langs)))  # uri -> (label, lang)
+
+        ids = np.fromiter(map(self.index.__getitem__, uris), dtype=np.int64, count=2 * m)
+        self.src = ids[:m]
+        self.dst = ids[m:]
+        weights = np.fromiter((e["weight"] or 1.0 for e in edges), dtype=np.float64, count=m)
+        self.weight = np.clip(weights, 1e-6, None)
+
+    def add_nodes(self, concepts: Iterable[Dict]):
+        """관계가 없는 개념도 점수를 받을 수 있도록 노드로 등록"""
+        for c in concepts:
+            if c["uri"] not in self.index:
+                self.index[c["uri"]] = len(self.uris)
+                self.uris.append(c["uri"])
+                self._info[c["uri"]] = (c["label"], c["lang"])
+
+    def node(self, idx: int) -> Dict:
+        uri = self.uris[idx]
+        label, lang = self._info[uri]
+        return {"uri": uri, "label": label, "lang": lang}
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.uris)
+
+    def personalized_pagerank(
+        self,
+        seed_uris: Iterable[str],
+        alpha: float = 0.15,
+        iterations: int = 20,
+        tol: float = 1e-6
+    ) -> np.ndarray:
+        """
+        재시작 확률 alpha의 Personalized PageRank (고정 반복 횟수 내 power iteration)
+
+        Returns:
+            노드 인덱스 순서의 점수 벡터 (합계 1)
+        """
+        n = self.num_nodes
+        if n == 0:
+            return np.zeros(0)
+
+        seeds = [self.index[u] for u in seed_uris if u in self.index]
+        p = np.zeros(n)
+        if seeds:
+            p[seeds] = 1.0 / len(seeds)
+        else:
+            p[:] = 1.0 / n
+
+        # 무방향 처리: 양방향 엣지로 확장 후 출발 노드 가중치 합으로 정규화
+        rows = np.concatenate([self.dst, self.src])
+        cols = np.concatenate([self.src, self.dst])
+        w = np.concatenate([self.weight, self.weight])
+        strength = np.bincount(cols, weights=w, minlength=n)
+        dangling = strength == 0
+        vals = w / strength[cols] if len(w) else w
+
+        if SCIPY_AVAILABLE:
+            transition = sparse.csr_matrix((vals, (rows, cols)), shape=(n, n))
+            matvec = transition.dot
+        else:
+            def matvec(x):
+                return np.bincount(rows, weights=vals * x[cols], minlength=n)
+
+        r = p.copy()
+        for _ in range(iterations):
+            # 연결이 없는 노드의 확률은 시드로 되돌림
+            r_next = (1 - alpha) * (matvec(r) + r[dangling].sum() * p) + alpha * p
+            if np.abs(r_next - r).sum() < tol:
+                r = r_next
+                break
+            r = r_next
+        return r
+
+def select_by_rank(
+    subgraph: LocalSubgraph,
+    scores: np.ndarray,
+    concepts: List[Dict],
+    relation_limit: int,
+    neighbor_limit: int
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    PPR 점수로 프롬프트에 넣을 개념/관계/이웃 개념 선택
+
+    Returns:
+        (concepts, relations, neighbors) - 모두 점수 내림차순
+    """
+    def score_of(uri: str) -> float:
+        idx = subgraph.index.get(uri)
+        return float(scores[idx]) if idx is not None else 0.0
+
+    ranked_concepts = sorted(
+        ({**c, "score": round(score_of(c["uri"]), 6)} for c in concepts),
+        key=lambda c: c["score"],
+        reverse=True
+    )
+
+    # 핵심 개념에 닿는 관계만, (양 끝 점수 합 × 가중치) 순
+    concept_idx = np.asarray([subgraph.index[c["uri"]] for c in concepts if c["uri"] in subgraph.index], dtype=np.int64)
+    relations = []
+    if len(subgraph.edges):
+        touches = np.isin(subgraph.src, concept_idx) | np.isin(subgraph.dst, concept_idx)
+        edge_scores = (scores[subgraph.src] + scores[subgraph.dst]) * subgraph.weight
+        candidates = np.flatnonzero(touches)
+        order = candidates[np.argsort(-edge_scores[candidates], kind="stable")][:relation_limit]
+        relations = [subgraph.edges[i] for i in order]
+
+    # 핵심 개념이 아닌 노드 중 점수 상위
+    mask = np.ones(subgraph.num_nodes, dtype=bool)
+    mask[concept_idx] = False
+    others = np.flatnonzero(mask)
+    order = others[np.argsort(-scores[others], kind="stable")][:neighbor_limit]
+    neighbors = [{**subgraph.node(i), "score": round(float(scores[i]), 6)} for i in order]
+
+    return ranked_concepts, relations, neighbors
@@ -0,0 +1,142 @@
+"""
+그래프 스냅샷 (읽기 전용, 메모리 매핑)
+인덱서가 내보낸 CSR 인접 배열과 노드 문자열 테이블을 np.load(mmap_mode="r")로 엽니다.
+페이지는 OS 페이지 캐시로 공유되므로 워커가 N개여도 메모리는 한 벌만 사용하며,
+로컬 서브그래프 확장을 Neo4j 왕복 없이 프로세스 안에서 처리합니다.
+"""
+import os
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+
+class GraphSnapshot:
+    def __init__(self, path: str):
+        self.path = os.path.realpath(path)
+        with open(os.path.join(self.path, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.rel_types: List[str] = self.manifest["rel_types"]
+        self.langs: List[str] = self.manifest["langs"]
+
+        def load(name):
+            return np.load(os.path.join(self.path, name), mmap_mode="r")
+
+        self.indptr = load("indptr.npy")
+        self.neighbors = load("neighbors.npy")
+        self.edge_ids = load("edge_ids.npy")
+        self.forward = load("forward.npy")
+        self.weights = load("weights.npy")
+        self.rel_codes = load("rel_codes.npy")
+        self.lang_codes = load("lang_codes.npy")
+        self._uri_off = load("uris.off.npy")
+        self._label_off = load("labels.off.npy")
+        self._uri_blob = self._blob("uris.bin")
+        self._label_blob = self._blob("labels.bin")
+
+    def _blob(self, name: str):
+        path = os.path.join(self.path, name)
+        if os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=np.uint8)
+        return np.memmap(path, dtype=np.uint8, mode="r")
+
+    @classmethod
+    def load(cls, artifact_dir: str) -> Optional["GraphSnapshot"]:
+        """<artifact_dir>/current 스냅샷 로드 (없으면 None → Neo4j 조회 사용)"""
+        current = os.path.join(artifact_dir, "current")
+        if not os.path.exists(os.path.join(current, "manifest.json")):
+            return None
+        try:
+            snapshot = cls(current)
+            print(f"✅ Graph snapshot mapped: {snapshot.manifest['nodes']} nodes, "
+                  f"{snapshot.manifest['edges']} edges ({snapshot.path})")
+            return snapshot
+        except Exception as e:
+            print(f"⚠️ Graph snapshot load failed: {e}. Falling back to Neo4j queries.")
+            return None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    def _uri_bytes(self, i: int) -> bytes:
+        return self._uri_blob[self._uri_off[i]:self._uri_off[i + 1]].tobytes()
+
+    def find(self, uri: str) -> int:
+        """uri의 노드 인덱스 (UTF-8 바이트 순 = 코드포인트 순 정렬 가정, 없으면 -1)"""
+        target = uri.encode("utf-8")
+        lo, hi = 0, self.num_nodes
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._uri_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.num_nodes and self._uri_bytes(lo) == target else -1
+
+    def node(self, i: int) -> Dict:
+        label = self._label_blob[self._label_off[i]:self._label_off[i + 1]].tobytes()
+        return {
+            "uri": self._uri_bytes(i).decode("utf-8"),
+            "label": label.decode("utf-8"),
+            "lang": self.langs[self.lang_codes[i]]
+        }
+
+    def expand(self, uris: List[str], hops: int, edge_limit: int) -> List[Dict]:
+        """
+        fetch_local_subgraph와 동일한 규칙(hop마다 가중치 높은 순, 전체 edge_limit개 이하)으로
+        시드에서 관계를 수집하여 같은 형식의 행을 반환
+        """
+        frontier = np.asarray([i for i in (self.find(u) for u in uris) if i >= 0], dtype=np.int64)
+        visited = set(frontier.tolist())
+        seen_edges = np.zeros(0, dtype=np.int64)
+        heads, positions = [], []
+
+        for _ in range(hops):
+            budget = edge_limit - sum(len(p) for p in positions)
+            if len(frontier) == 0 or budget <= 0:
+                break
+
+            # 프런티어 노드들의 인접 구간을 한 번에 펼치기
+            starts = np.asarray(self.indptr[frontier])
+            lengths = np.asarray(self.indptr[frontier + 1]) - starts
+            total = int(lengths.sum())
+            if total == 0:
+                break
+            pos = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+            head = np.repeat(frontier, lengths)
+
+            # 이미 수집한 엣지 / 같은 hop의 양방향 중복 제거 후 가중치 순으로 예산만큼
+            eids = np.asarray(self.edge_ids[pos], dtype=np.int64)
+            _, first = np.unique(eids, return_index=True)
+            keep = first[~np.isin(eids[first], seen_edges)]
+            keep = keep[np.argsort(-np.asarray(self.weights[eids[keep]]), kind="stable")][:budget]
+
+            seen_edges = np.concatenate([seen_edges, eids[keep]])
+            positions.append(pos[keep])
+            heads.append(head[keep])
+
+            next_nodes = []
+            for v in np.asarray(self.neighbors[pos[keep]]).tolist():
+                if v not in visited:
+                    visited.add(v)
+                    next_nodes.append(v)
+            frontier = np.asarray(next_nodes, dtype=np.int64)
+
+        rows = []
+        for head, pos in zip(heads, positions):
+            for h, p in zip(head.tolist(), pos.tolist()):
+                other = int(self.neighbors[p])
+                s, e = (h, other) if self.forward[p] else (other, h)
+                eid = int(self.edge_ids[p])
+                start, end = self.node(s), self.node(e)
+                rows.append({
+                    "start": start["label"],
+                    "rel_type": self.rel_types[self.rel_codes[eid]],
+                    "end": end["label"],
+                    "weight": float(self.weights[eid]),
+                    "start_lang": start["lang"],
+                    "end_lang": end["lang"],
+                    "start_uri": start["uri"],
+                    "end_uri": end["uri"]
+                })
+        return rows
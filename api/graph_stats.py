@@ -0,0 +1,81 @@
+"""
+그래프 통계 스냅샷 모듈
+/stats 요청마다 전체 라벨 스캔을 하지 않도록, 인덱서가 빌드 시 저장한
+(:GraphStats) 통계를 읽어 Redis와 프로세스 메모리에 보관하고
+CACHE_TTL["stats"] 주기로 백그라운드에서 갱신합니다.
+"""
+import json
+import time
+import asyncio
+from typing import Dict, Optional
+
+from cache_manager import CacheManager
+
+class GraphStatsProvider:
+    def __init__(self, graph, cache: CacheManager, ttl: int = 300):
+        self.graph = graph
+        self.cache = cache
+        self.ttl = ttl
+        self.snapshot: Optional[Dict] = None
+        self.fetched_at = 0.0
+        self._task = None
+
+    def _load_from_graph(self) -> Dict:
+        """인덱서가 저장한 통계 우선, 없으면 총계와 언어별 개념 수를 직접 조회"""
+        rows = self.graph.read("""
+            MATCH (s:GraphStats {key: 'current'})
+            RETURN s.payload as payload
+            """)
+        if rows and rows[0]["payload"]:
+            stats = json.loads(rows[0]["payload"])
+            stats["source"] = "indexer"
+            return stats
+
+        # 라벨/타입 하나만 지정한 count(*)는 count store에서 바로 응답 (스캔 없음)
+        total_concepts = self.graph.read("MATCH (c:Concept) RETURN count(c) as cnt")[0]['cnt']
+        total_relations = self.graph.read("MATCH ()-[r:RELATED]->() RETURN count(r) as cnt")[0]['cnt']
+        # 언어별 집계는 전체 스캔이지만 결과가 TTL 동안 캐시되므로 갱신 주기마다 한 번만 실행
+        concepts_by_language = self.graph.read("""
+            MATCH (c:Concept)
+            RETURN c.language as lang, count(*) as cnt
+            ORDER BY cnt DESC
+            """)
+        return {
+            "total_concepts": total_concepts,
+            "total_relations": total_relations,
+            "concepts_by_language": concepts_by_language,
+            "source": "graph"
+        }
+
+    async def refresh(self):
+        """Redis 스냅샷 → Neo4j 순으로 통계 갱신"""
+        stats = await self.cache.get("stats", "graph")
+        if stats is None:
+            stats = await asyncio.to_thread(self._load_from_graph)
+            await self.cache.set("stats", "graph", stats, self.ttl)
+        self.snapshot = stats
+        self.fetched_at = time.time()
+
+    async def get(self) -> Dict:
+        """현재 스냅샷 반환 (없거나 백그라운드 갱신이 멈춰 오래된 경우에만 직접 조회)"""
+        if self.snapshot is None or time.time() - self.fetched_at > self.ttl * 2:
+            await self.refresh()
+        return {**self.snapshot, "snapshot_age_sec": round(time.time() - self.fetched_at, 1)}
+
+    def start(self):
+        """TTL 주기로 스냅샷을 갱신하는 백그라운드 태스크 시작"""
+        async def _loop():
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Stats refresh failed: {e}")
+                await asyncio.sleep(self.ttl)
+
+        if not self._task:
+            self._task = asyncio.create_task(_loop())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
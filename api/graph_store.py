@@ -0,0 +1,86 @@
+"""
+Neo4j 읽기 전용 드라이버 계층
+공식 neo4j 드라이버의 커넥션 풀과 관리형 읽기 트랜잭션(자동 재시도)을 사용합니다.
+NEO4J_URI를 neo4j:// 스킴으로 지정하면 클러스터 라우팅으로 읽기를
+팔로워/읽기 복제본에 분산합니다. (bolt:// 는 단일 서버 직접 연결)
+"""
+import os
+from typing import Dict, List, Optional
+
+from neo4j import GraphDatabase, READ_ACCESS, unit_of_work
+
+class GraphStore:
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        password: str,
+        database: Optional[str] = None,
+        max_pool_size: int = 50,
+        acquisition_timeout: float = 30.0,
+        max_retry_time: float = 15.0
+    ):
+        """
+        Args:
+            database: 대상 데이터베이스 (None이면 서버 기본값)
+            max_pool_size: 서버당 최대 커넥션 수 (스레드풀 워커 수 이상 권장)
+            acquisition_timeout: 풀에서 커넥션을 얻기까지 최대 대기 시간 (초)
+            max_retry_time: 일시적 오류 시 관리형 트랜잭션 재시도 총 시간 (초)
+        """
+        self.uri = uri
+        self.database = database
+        self._auth = (user, password)
+        self._driver_config = {
+            "max_connection_pool_size": max_pool_size,
+            "connection_acquisition_timeout": acquisition_timeout,
+            "max_transaction_retry_time": max_retry_time,
+            "keep_alive": True
+        }
+        self._driver = None
+
+    def connect(self):
+        """드라이버(커넥션 풀) 생성 - fork 이후 워커별로 호출"""
+        if self._driver is None:
+            self._driver = GraphDatabase.driver(self.uri, auth=self._auth, **self._driver_config)
+        return self._driver
+
+    @property
+    def driver(self):
+        return self._driver or self.connect()
+
+    @classmethod
+    def from_env(cls) -> "GraphStore":
+        return cls(
+            os.getenv("NEO4J_URI", "bolt://neo4j:7687"),
+            os.getenv("NEO4J_USER", "neo4j"),
+            os.getenv("NEO4J_PASSWORD", "neo4j"),
+            database=os.getenv("NEO4J_DATABASE") or None,
+            max_pool_size=int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),
+            acquisition_timeout=float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30")),
+            max_retry_time=float(os.getenv("NEO4J_MAX_RETRY_TIME", "15"))
+        )
+
+    def read(self, query: str, timeout: Optional[float] = None, **params) -> List[Dict]:
+        """
+        관리형 읽기 트랜잭션으로 Cypher 실행 (일시적 오류 시 자동 재시도)
+        
+        Args:
+            timeout: 서버 측 트랜잭션 타임아웃 (초, None이면 서버 기본값)
+                     'timeout'은 Cypher 파라미터 이름으로 사용할 수 없습니다.
+        """
+        @unit_of_work(timeout=timeout)
+        def _work(tx):
+            # 재시도 시 부분 결과가 섞이지 않도록 트랜잭션 안에서 모두 소비
+            return tx.run(query, params).data()
+
+        with self.driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+            return session.execute_read(_work)
+
+    def ping(self):
+        """연결 확인 (실패 시 예외 발생)"""
+        self.driver.verify_connectivity()
+
+    def close(self):
+        if self._driver is not None:
+            self._driver.close()
+            self._driver = None
@@ -0,0 +1,18 @@
+"""
+gunicorn 설정 (멀티 워커 운영 모드)
+    gunicorn -c gunicorn.conf.py main:app
+
+preload_app으로 main을 fork 전에 한 번 import하여 그래프 스냅샷 등 읽기 전용 데이터를
+워커 간에 공유하고, Neo4j/Redis 연결은 각 워커의 lifespan에서 따로 생성합니다.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('API_PORT', '8000')}"
+workers = int(os.getenv("API_WORKERS", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# LLM 생성(최대 120초)보다 길게
+timeout = int(os.getenv("API_WORKER_TIMEOUT", "180"))
+graceful_timeout = 30
+keepalive = 5
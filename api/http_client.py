@@ -0,0 +1,129 @@
+"""
+공유 HTTP 클라이언트 모듈
+Ollama 호출마다 새 TCP 연결을 여는 대신 keep-alive 커넥션 풀을 재사용하고,
+연결 실패와 일시적인 서버 오류(RETRY_STATUS)만 지터가 포함된 지수 백오프로 재시도합니다.
+읽기 타임아웃은 서버가 이미 처리 중일 수 있으므로 재시도하지 않습니다.
+"""
+import os
+import time
+import random
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 재시도 대상 HTTP 상태 코드 (일시적인 서버 오류)
+RETRY_STATUS = {429, 502, 503, 504}
+
+class PooledHttpClient:
+    def __init__(
+        self,
+        pool_size: int = 20,
+        max_retries: int = 2,
+        backoff_base: float = 0.2,
+        backoff_max: float = 5.0,
+        connect_timeout: float = 3.0
+    ):
+        """
+        Args:
+            pool_size: 호스트당 유지할 최대 keep-alive 연결 수
+            max_retries: 기본 재시도 횟수 (호출별로 재정의 가능)
+            backoff_base: 첫 재시도 대기 상한 (초), 시도마다 2배
+            backoff_max: 재시도 대기 최대값 (초)
+            connect_timeout: TCP 연결 타임아웃 (초)
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.connect_timeout = connect_timeout
+
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0}
+
+    @classmethod
+    def from_env(cls) -> "PooledHttpClient":
+        return cls(
+            pool_size=int(os.getenv("OLLAMA_POOL_SIZE", "20")),
+            max_retries=int(os.getenv("OLLAMA_MAX_RETRIES", "2")),
+            backoff_base=float(os.getenv("OLLAMA_BACKOFF_BASE", "0.2")),
+            connect_timeout=float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "3"))
+        )
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _backoff(self, attempt: int):
+        """full jitter: [0, min(max, base * 2^attempt)] 범위에서 무작위 대기"""
+        time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt))))
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: float = 30,
+        retries: Optional[int] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        재시도 포함 HTTP 요청
+
+        Args:
+            timeout: 응답 대기 타임아웃 (초), 연결 타임아웃은 connect_timeout 사용
+            retries: 연결 실패/RETRY_STATUS 시 재시도 횟수 (None이면 기본값)
+        """
+        retries = self.max_retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            self._count("requests")
+            try:
+                resp = self.session.request(
+                    method, url, timeout=(self.connect_timeout, timeout), **kwargs
+                )
+                if resp.status_code not in RETRY_STATUS or attempt == retries:
+                    return resp
+            except requests.ConnectionError:
+                # 연결 실패 (ConnectTimeout 포함)
+                if attempt == retries:
+                    self._count("failures")
+                    raise
+            except requests.Timeout:
+                # 읽기 타임아웃: 같은 요청을 다시 보내면 대기 시간만 배로 늘어나므로 바로 실패
+                self._count("failures")
+                raise
+            self._count("retries")
+            self._backoff(attempt)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def metrics(self) -> Dict:
+        """요청/재시도 횟수와 커넥션 재사용률"""
+        opened = served = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                served += pool.num_requests
+
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "connections_opened": opened,
+            "pooled_requests": served,
+            "connection_reuse_ratio": round(1 - opened / served, 4) if served else None
+        }
+
+# Ollama 호출용 공유 클라이언트 (프로세스당 1개)
+ollama_http = PooledHttpClient.from_env()
@@ -5,32 +5,203 @@
 - 프롬프트 엔지니어링 개선
 """
 import os
-import requests
-from typing import List, Dict
+import time
+
+# 프로세스 시작 시각 (time-to-first-ready 측정 기준, 다른 import보다 먼저 기록)
+PROCESS_STARTED_AT = time.time()
+PROCESS_PID = os.getpid()
+
+import json
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Tuple
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from py2neo import Graph
 
 from embedding_search import EmbeddingSearcher
+from cache_manager import cache, CACHE_TTL
+from query_log import QueryLog
+from http_client import ollama_http
+from graph_store import GraphStore
+from graph_stats import GraphStatsProvider
+from cache_warmer import CacheWarmer
+from startup import StartupTracker
+# NumPy/SciPy에 의존하는 graph_ranking / graph_paths / graph_snapshot 모듈은
+# import 시간을 줄이기 위해 시작 후 백그라운드(load_artifacts) 또는 첫 사용 시 로드합니다.
 
 # 환경 변수
-NEO4J_URI  = os.getenv("NEO4J_URI","bolt://neo4j:7687")
-NEO4J_USER = os.getenv("NEO4J_USER","neo4j")
-NEO4J_PASS = os.getenv("NEO4J_PASSWORD","neo4j")
 OLLAMA_URL = os.getenv("OLLAMA_URL","http://ollama:11434")
 LLM_MODEL  = os.getenv("LLM_MODEL","mistral")
 
-# Neo4j 연결
-graph = Graph(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+# 질의 로그 / 캐시 워밍업 설정
+QUERY_LOG_PATH       = os.getenv("QUERY_LOG_PATH","/app/logs/query_log.jsonl")
+QUERY_LOG_MAX_MB     = int(os.getenv("QUERY_LOG_MAX_MB","20"))
+CACHE_WARMUP_ENABLED = os.getenv("CACHE_WARMUP_ENABLED","true").lower() == "true"
+CACHE_WARMUP_TOP_N   = int(os.getenv("CACHE_WARMUP_TOP_N","50"))
+CACHE_WARMUP_QPS     = float(os.getenv("CACHE_WARMUP_QPS","2"))
+CACHE_WARMUP_ANSWERS = os.getenv("CACHE_WARMUP_ANSWERS","true").lower() == "true"
+CACHE_WARMUP_MAX_SEC = float(os.getenv("CACHE_WARMUP_MAX_SEC","120"))
+CACHE_VERSION_REFRESH_SEC = float(os.getenv("CACHE_VERSION_REFRESH_SEC","10"))
+
+# 그래프 순위화 설정 (로컬 서브그래프 크기 / Personalized PageRank)
+SUBGRAPH_EDGE_LIMIT = int(os.getenv("SUBGRAPH_EDGE_LIMIT","3000"))
+PPR_ALPHA           = float(os.getenv("PPR_ALPHA","0.15"))
+PPR_ITERATIONS      = int(os.getenv("PPR_ITERATIONS","20"))
+
+# 핵심 개념 간 경로 탐색 설정
+PATH_TOP_K          = int(os.getenv("PATH_TOP_K","4"))
+PATH_MAX_HOPS       = int(os.getenv("PATH_MAX_HOPS","3"))
+PATH_TIME_BUDGET_MS = float(os.getenv("PATH_TIME_BUDGET_MS","300"))
+
+# 인덱서가 내보낸 그래프 스냅샷 디렉토리 (없으면 Neo4j에서 서브그래프 조회)
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR","/artifacts")
+
+# Neo4j 읽기 드라이버 (NEO4J_URI / NEO4J_MAX_POOL_SIZE 등 환경 변수로 설정)
+# 커넥션 풀은 fork 이후 워커별로 lifespan에서 생성
+graph = GraphStore.from_env()
+
+# 읽기 전용 그래프 스냅샷: 시작 후 백그라운드에서 메모리 매핑
+# (mmap 페이지는 OS 페이지 캐시로 워커 간 공유되며, 로드 전에는 Neo4j 조회 사용)
+snapshot = None
+
+def reload_snapshot(generation: int = 0):
+    """스냅샷 (다시) 매핑 - 그래프 재빌드(세대 변경) 시에도 호출"""
+    global snapshot
+    from graph_snapshot import GraphSnapshot
+    snapshot = GraphSnapshot.load(ARTIFACT_DIR)
+
+def load_artifacts():
+    """무거운 모듈과 그래프 스냅샷 로드 (스레드에서 실행)"""
+    import graph_ranking, graph_paths  # noqa: F401  NumPy/SciPy 포함
+    reload_snapshot()
+
+# 시작 상태: Neo4j 연결과 캐시 워밍업이 끝나야 ready
+startup = StartupTracker(required=["neo4j", "cache_warmup"], started_at=PROCESS_STARTED_AT)
+STARTUP_DEPENDENCY_WAIT_SEC = float(os.getenv("STARTUP_DEPENDENCY_WAIT_SEC","60"))
+# 준비 후 의존 서비스 재확인 주기 (readiness가 현재 상태를 반영하도록)
+HEALTH_PROBE_INTERVAL_SEC = float(os.getenv("HEALTH_PROBE_INTERVAL_SEC","10"))
 
 # 임베딩 검색기 초기화
 embedder = EmbeddingSearcher(OLLAMA_URL, LLM_MODEL)
 
+# 질의 로그
+query_log = QueryLog(QUERY_LOG_PATH, max_bytes=QUERY_LOG_MAX_MB << 20)
+
+async def replay_logged_query(entry: Dict) -> bool:
+    """워밍업: 로그된 질문을 재생하여 키워드/임베딩/검색/답변 캐시 채우기"""
+    params = entry.get("params", {})
+    req = ChatRequest(query=entry["query"], **params)
+    ollama_ready = startup.is_ready("ollama")
+    if req.search_mode != "simple" and not ollama_ready:
+        return False  # 키워드 추출/임베딩에 Ollama 필요: 타임아웃·재시도에 시간 쓰지 않음
+    context = await search_graph_cached(
+        req.query, req.k, req.search_mode, req.include_neighbors, req.max_hops
+    )
+    if entry.get("endpoint") == "chat" and CACHE_WARMUP_ANSWERS and ollama_ready:
+        prompt = build_enhanced_prompt(req.query, context, context.get("keywords", []))
+        await call_llm_cached(prompt, store=not context.get("degraded"))
+    return True
+
+async def warm_keyword(keyword: str) -> bool:
+    """워밍업: 키워드의 후보 개념 라벨 임베딩 채우기"""
+    if not startup.is_ready("ollama"):
+        return False
+    concepts = await run_in_threadpool(embedder.find_candidates, graph, [keyword])
+    await embedder.get_embeddings_cached([c['label'] for c in concepts], cache, CACHE_TTL["embedding"])
+    return True
+
+warmer = CacheWarmer(
+    query_log,
+    cache,
+    replay_query=replay_logged_query,
+    warm_keyword=warm_keyword,
+    top_n=CACHE_WARMUP_TOP_N if CACHE_WARMUP_ENABLED else 0,
+    qps=CACHE_WARMUP_QPS,
+    max_duration=CACHE_WARMUP_MAX_SEC
+)
+
+# /stats 스냅샷 (CACHE_TTL["stats"] 주기로 백그라운드 갱신)
+stats_provider = GraphStatsProvider(graph, cache, CACHE_TTL["stats"])
+
+async def connect_neo4j():
+    await asyncio.to_thread(graph.ping)
+
+async def connect_redis():
+    if not cache.enabled:
+        return  # redis 패키지 없음: 캐시 없이 동작
+    if not await cache.connect():
+        raise ConnectionError("Redis unavailable")
+    # 인덱서가 올린 그래프 세대 번호 반영 후 주기적으로 확인
+    await cache.refresh_generation()
+    cache.start_generation_watch(CACHE_VERSION_REFRESH_SEC)
+
+async def ping_redis():
+    if cache.enabled and not (cache.client and await cache.client.ping()):
+        raise ConnectionError("Redis unavailable")
+
+async def check_ollama():
+    resp = await asyncio.to_thread(ollama_http.get, f"{OLLAMA_URL}/api/tags", timeout=5, retries=0)
+    resp.raise_for_status()
+
+async def run_startup():
+    """의존 서비스 연결과 아티팩트 로드를 동시에 진행하고, 준비되면 캐시 워밍업"""
+    # (시작, 준비 후 재확인) - 아티팩트는 한 번만 로드
+    monitored = {
+        "neo4j": (connect_neo4j, connect_neo4j),
+        "redis": (connect_redis, ping_redis),
+        "ollama": (check_ollama, check_ollama)
+    }
+    tasks = {
+        name: asyncio.create_task(startup.run_component(name, start))
+        for name, (start, _) in monitored.items()
+    }
+    tasks["artifacts"] = asyncio.create_task(startup.run_component("artifacts", lambda: asyncio.to_thread(load_artifacts)))
+
+    async def monitor_after_start(name, probe):
+        await tasks[name]
+        await startup.monitor(name, probe, HEALTH_PROBE_INTERVAL_SEC)
+
+    monitors = [asyncio.create_task(monitor_after_start(name, probe)) for name, (_, probe) in monitored.items()]
+    
+    # 워밍업에 필요한 구성요소를 일정 시간까지만 기다림 (늦게 뜨면 워밍업 없이 진행)
+    await asyncio.wait(
+        [tasks["neo4j"], tasks["redis"], tasks["ollama"]],
+        timeout=STARTUP_DEPENDENCY_WAIT_SEC
+    )
+    startup.mark("cache_warmup", "connecting")
+    if startup.is_ready("neo4j"):
+        await warmer.run()
+    else:
+        # 재생이 전부 Neo4j 타임아웃으로 끝나므로 워밍업 없이 진행 (ready는 Neo4j 연결 후)
+        warmer.skip("neo4j not ready")
+    startup.mark("cache_warmup", "ready")
+    await asyncio.gather(*tasks.values(), *monitors)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getpid() != PROCESS_PID:
+        # gunicorn preload: 마스터에서 import 후 fork된 워커(재시작된 워커 포함)는 워커 시작 시점부터 측정
+        startup.reset()
+    # 워커별 드라이버 생성만 하고 실제 연결은 백그라운드에서 (import/시작이 의존 서비스에 막히지 않음)
+    graph.connect()
+    cache.add_generation_listener(reload_snapshot)
+    stats_provider.start()
+    startup_task = asyncio.create_task(run_startup())
+    yield
+    startup_task.cancel()
+    stats_provider.stop()
+    await asyncio.to_thread(query_log.close)
+    await cache.disconnect()
+    graph.close()
+
 # FastAPI 앱
 app = FastAPI(
     title="GraphRAG API (Improved)",
     description="ConceptNet 기반 의미 검색 및 질의응답 API",
-    version="2.0"
+    version="2.0",
+    lifespan=lifespan
 )
 
 @app.get("/")
@@ -47,46 +218,50 @@ def root():
         ]
     }
 
+@app.get("/health/live")
+def health_live():
+    """프로세스 생존 확인 (의존 서비스 상태와 무관하게 200)"""
+    return {"status": "alive", "uptime_sec": startup.report()["uptime_sec"]}
+
 @app.get("/health")
+@app.get("/health/ready")
 def health():
-    """서비스 헬스체크"""
-    try:
-        graph.run("RETURN 1").data()
-        neo4j_status = "healthy"
-    except Exception as e:
-        neo4j_status = f"unhealthy: {str(e)}"
-    
-    try:
-        resp = requests.get(f"{OLLAMA_URL}/api/tags", timeout=5)
-        ollama_status = "healthy" if resp.status_code == 200 else "unhealthy"
-    except Exception as e:
-        ollama_status = f"unhealthy: {str(e)}"
-    
+    """서비스 준비 상태 (Neo4j 연결과 캐시 워밍업 전, 또는 Neo4j 장애 중에는 503)"""
+    report = startup.report()
+    body = {
+        "status": "ok",
+        "neo4j": startup.components.get("neo4j", {}).get("state", "pending"),
+        "redis": startup.components.get("redis", {}).get("state", "pending"),
+        "ollama": startup.components.get("ollama", {}).get("state", "pending"),
+        "snapshot": "mapped" if snapshot is not None else "neo4j_fallback",
+        "cache_warmup": warmer.state,
+        "time_to_ready_sec": report["time_to_ready_sec"]
+    }
+    if not report["ready"]:
+        # 한 번도 ready가 아니었으면 시작 중, 이후라면 의존 서비스 장애
+        body["status"] = "starting" if report["time_to_ready_sec"] is None else "unavailable"
+        body["components"] = report["components"]
+        return JSONResponse(status_code=503, content=body)
+    if not (startup.is_ready("redis") and startup.is_ready("ollama")):
+        body["status"] = "degraded"
+    return body
+
+@app.get("/metrics")
+def metrics():
+    """캐시 히트율, Ollama 커넥션 재사용률, 워밍업/시작 리포트"""
     return {
-        "status": "ok" if neo4j_status == "healthy" and ollama_status == "healthy" else "degraded",
-        "neo4j": neo4j_status,
-        "ollama": ollama_status
+        "cache": cache.hit_rates(),
+        "ollama_http": ollama_http.metrics(),
+        "graph_version": cache.generation,
+        "cache_warmup": warmer.report or {"state": warmer.state},
+        "startup": startup.report()
     }
 
 @app.get("/stats")
-def get_stats():
-    """그래프 통계 정보"""
+async def get_stats():
+    """그래프 통계 정보 (인덱서가 저장한 통계의 캐시된 스냅샷)"""
     try:
-        stats = graph.run("""
-            MATCH (c:Concept)
-            WITH c.language as lang, count(*) as cnt
-            RETURN lang, cnt
-            ORDER BY cnt DESC
-            """).data()
-        
-        total_concepts = graph.run("MATCH (c:Concept) RETURN count(c) as cnt").data()[0]['cnt']
-        total_relations = graph.run("MATCH ()-[r:RELATED]->() RETURN count(r) as cnt").data()[0]['cnt']
-        
-        return {
-            "total_concepts": total_concepts,
-            "total_relations": total_relations,
-            "concepts_by_language": stats
-        }
+        return await stats_provider.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"통계 조회 실패: {str(e)}")
 
@@ -97,12 +272,97 @@ class ChatRequest(BaseModel):
     include_neighbors: bool = True
     max_hops: int = 2
 
+def find_simple_concepts(question: str, k: int) -> List[Dict]:
+    """단순 문자열 매칭"""
+    return graph.read("""
+        MATCH (c:Concept)
+        WHERE c.language = 'ko' 
+          AND (toLower(c.label) CONTAINS toLower($q))
+        RETURN c.uri as uri, c.label as label, c.language as lang
+        LIMIT $k
+        """, q=question, k=k)
+
+def fetch_local_subgraph(uris: List[str], hops: int, edge_limit: int) -> List[Dict]:
+    """
+    시드 개념에서 hop 단위로 확장하며 관계를 수집 (hop마다 가중치 높은 순, 전체 edge_limit개 이하)
+    이미 수집한 관계는 LIMIT 전에 제외하므로 스냅샷 경로(GraphSnapshot.expand)와 결과가 같습니다.
+    그래프 스냅샷이 있으면 Neo4j 왕복 없이 메모리 매핑된 인접 배열에서 확장합니다.
+    """
+    if snapshot is not None:
+        return snapshot.expand(uris, hops, edge_limit)
+    
+    edges = []
+    seen_edges = set()
+    visited = set(uris)
+    frontier = list(uris)
+    
+    for _ in range(hops):
+        budget = edge_limit - len(edges)
+        if not frontier or budget <= 0:
+            break
+        
+        rows = graph.read("""
+            MATCH (c1:Concept)-[r:RELATED]-(:Concept)
+            WHERE c1.uri IN $uris
+            WITH DISTINCT r
+            WHERE NOT elementId(r) IN $seen
+            ORDER BY r.weight DESC
+            LIMIT $lim
+            WITH r, startNode(r) as s, endNode(r) as e
+            RETURN elementId(r) as id, s.label as start, r.type as rel_type, e.label as end,
+                   r.weight as weight, s.language as start_lang, e.language as end_lang,
+                   s.uri as start_uri, e.uri as end_uri
+            """, uris=frontier, seen=list(seen_edges), lim=budget)
+        
+        frontier = []
+        for row in rows:
+            seen_edges.add(row.pop('id'))
+            edges.append(row)
+            for uri in (row['start_uri'], row['end_uri']):
+                if uri not in visited:
+                    visited.add(uri)
+                    frontier.append(uri)
+    
+    return edges
+
+def find_core_paths(subgraph: "LocalSubgraph", uris: List[str]) -> List[Dict]:
+    """
+    핵심 개념 쌍 간 경로 (PATH_MAX_HOPS 이내, 전체 PATH_TIME_BUDGET_MS 이내)
+    서브그래프에서 못 찾은 쌍만 UNWIND 쿼리 한 번으로 Neo4j에서 보충합니다.
+    """
+    if len(uris) < 2:
+        return []
+    
+    from graph_paths import find_pair_paths
+    
+    deadline = time.monotonic() + PATH_TIME_BUDGET_MS / 1000
+    paths, unresolved = find_pair_paths(subgraph, uris, PATH_MAX_HOPS, deadline)
+    
+    remaining = deadline - time.monotonic()
+    if unresolved and remaining > 0:
+        try:
+            rows = graph.read(f"""
+                UNWIND $pairs AS pair
+                MATCH (c1:Concept {{uri: pair[0]}}), (c2:Concept {{uri: pair[1]}})
+                MATCH path = shortestPath((c1)-[:RELATED*..{PATH_MAX_HOPS}]-(c2))
+                RETURN [n in nodes(path) | n.label] as node_labels,
+                       [r in relationships(path) | r.type] as rel_types
+                """, timeout=remaining, pairs=[list(p) for p in unresolved])
+            paths.extend(rows)
+        except Exception as e:
+            # 시간 예산 초과 등: 서브그래프에서 찾은 경로만 사용
+            print(f"⚠️ Path lookup skipped: {e}")
+    
+    return paths
+
 def search_graph_improved(
     question: str, 
     k: int = 8,
     search_mode: str = "hybrid",
     include_neighbors: bool = True,
-    max_hops: int = 2
+    max_hops: int = 2,
+    concepts: Optional[List[Dict]] = None,
+    keywords: Optional[List[str]] = None
 ) -> Dict:
     """
     개선된 그래프 검색
@@ -113,28 +373,17 @@ def search_graph_improved(
         search_mode: 검색 모드 (simple/embedding/hybrid)
         include_neighbors: 이웃 개념 포함 여부
         max_hops: 최대 탐색 거리
+        concepts: 이미 찾은 핵심 개념 (주어지면 1단계 생략)
+        keywords: concepts와 함께 사용된 키워드
     """
-    concepts = []
-    keywords = []
+    keywords = keywords or []
     
     # 1. 검색 모드에 따른 개념 추출
-    if search_mode == "simple":
-        # 단순 문자열 매칭
-        concepts = graph.run("""
-            MATCH (c:Concept)
-            WHERE c.language = 'ko' 
-              AND (toLower(c.label) CONTAINS toLower($q))
-            RETURN c.uri as uri, c.label as label, c.language as lang
-            LIMIT $k
-            """, q=question, k=k).data()
-    
-    elif search_mode == "embedding":
-        # 임베딩 기반 검색
-        concepts, keywords = embedder.search_with_embedding(graph, question, k)
-    
-    else:  # hybrid (기본값)
-        # 하이브리드: 키워드 추출 + 그래프 탐색
-        concepts, keywords = embedder.search_with_embedding(graph, question, k)
+    if concepts is None:
+        if search_mode == "simple":
+            concepts = find_simple_concepts(question, k)
+        else:  # embedding / hybrid: 키워드 추출 + 그래프 탐색
+            concepts, keywords = embedder.search_with_embedding(graph, question, k)
     
     if not concepts:
         return {
@@ -145,46 +394,28 @@ def search_graph_improved(
             "search_mode": search_mode
         }
     
+    from graph_ranking import LocalSubgraph, select_by_rank
     concept_uris = [c['uri'] for c in concepts]
     
-    # 2. 관계 추출 (가중치 높은 순)
-    relations = graph.run("""
-        MATCH (c1:Concept)-[r:RELATED]->(c2:Concept)
-        WHERE c1.uri IN $uris OR c2.uri IN $uris
-        RETURN c1.label as start, r.type as rel_type, c2.label as end, 
-               r.weight as weight, c1.language as start_lang, c2.language as end_lang,
-               c1.uri as start_uri, c2.uri as end_uri
-        ORDER BY r.weight DESC
-        LIMIT $lim
-        """, uris=concept_uris, lim=k*10).data()
-    
-    # 3. 이웃 개념 (n-hop)
-    neighbors = []
-    if include_neighbors:
-        neighbors = graph.run(f"""
-            MATCH (c1:Concept)-[:RELATED*1..{max_hops}]-(c2:Concept)
-            WHERE c1.uri IN $uris AND c1 <> c2
-            RETURN DISTINCT c2.label as label, c2.language as lang, c2.uri as uri
-            LIMIT $lim
-            """, uris=concept_uris, lim=k*5).data()
+    # 2. 로컬 서브그래프 수집 (이웃 포함 시 max_hops, 아니면 관계용 1-hop)
+    edges = fetch_local_subgraph(concept_uris, max_hops if include_neighbors else 1, SUBGRAPH_EDGE_LIMIT)
+    subgraph = LocalSubgraph(edges)
+    subgraph.add_nodes(concepts)
     
-    # 4. 경로 정보 (추가)
-    paths = []
-    if len(concepts) >= 2:
-        # 두 핵심 개념 간의 최단 경로 찾기
-        uri_pairs = [(concepts[0]['uri'], concepts[1]['uri'])]
-        
-        for uri1, uri2 in uri_pairs:
-            path_query = """
-                MATCH path = shortestPath((c1:Concept)-[:RELATED*..3]-(c2:Concept))
-                WHERE c1.uri = $uri1 AND c2.uri = $uri2
-                RETURN [n in nodes(path) | n.label] as node_labels,
-                       [r in relationships(path) | r.type] as rel_types
-                LIMIT 1
-                """
-            path_result = graph.run(path_query, uri1=uri1, uri2=uri2).data()
-            if path_result:
-                paths.append(path_result[0])
+    # 3. 키워드 매칭 개념을 시드로 Personalized PageRank → 개념/관계/이웃 선택
+    seed_uris = [
+        c['uri'] for c in concepts
+        if any(kw.lower() in c['label'].lower() for kw in keywords)
+    ] or concept_uris
+    scores = subgraph.personalized_pagerank(seed_uris, alpha=PPR_ALPHA, iterations=PPR_ITERATIONS)
+    concepts, relations, neighbors = select_by_rank(
+        subgraph, scores, concepts,
+        relation_limit=k*10,
+        neighbor_limit=k*5 if include_neighbors else 0
+    )
+    
+    # 4. 경로 정보: 상위 핵심 개념의 모든 쌍을 서브그래프에서 한 번에 탐색
+    paths = find_core_paths(subgraph, [c['uri'] for c in concepts[:PATH_TOP_K]])
     
     return {
         "concepts": concepts,
@@ -275,33 +506,138 @@ def build_enhanced_prompt(question: str, context: Dict, keywords: List[str]) ->
     
     return prompt
 
+def _generate(prompt: str, temperature: float) -> str:
+    """Ollama 생성 API 호출 (실패 시 예외 발생)"""
+    resp = ollama_http.post(
+        f"{OLLAMA_URL}/api/generate",
+        json={
+            "model": LLM_MODEL, 
+            "prompt": prompt, 
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "num_predict": 512
+            }
+        },
+        timeout=120,
+        retries=1  # 연결 실패·503 등만 1회 재시도 (읽기 타임아웃은 바로 실패)
+    )
+    resp.raise_for_status()
+    return resp.json().get("response", "")
+
 def call_llm(prompt: str, temperature: float = 0.7) -> str:
     """LLM 호출"""
     try:
-        resp = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": LLM_MODEL, 
-                "prompt": prompt, 
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": 512
-                }
-            },
-            timeout=120
+        return _generate(prompt, temperature)
+    except Exception as e:
+        return f"LLM 응답 생성 실패: {str(e)}"
+
+# ===== 캐시 적용 파이프라인 =====
+
+async def extract_keywords_cached(query: str) -> Tuple[List[str], bool]:
+    """
+    키워드 추출 (캐시 우선)
+    
+    Returns:
+        (keywords, ok): ok가 False면 LLM 실패 폴백 키워드 (캐싱하지 않음)
+    """
+    key_data = f"{LLM_MODEL}|{query}"
+    keywords = await cache.get("keywords", key_data)
+    if keywords is not None:
+        return keywords, True
+    
+    keywords, ok = await run_in_threadpool(embedder.extract_keywords_checked, query)
+    if ok:
+        await cache.set("keywords", key_data, keywords, CACHE_TTL["keywords"])
+    return keywords, ok
+
+async def resolve_concepts(question: str, k: int, search_mode: str) -> Tuple[List[Dict], List[str], bool]:
+    """
+    검색 모드에 따라 핵심 개념과 키워드 결정
+    
+    Returns:
+        (concepts, keywords, degraded): degraded가 True면 키워드 폴백이나 재순위 생략 등
+        Ollama 실패로 품질이 낮아진 결과 (검색/답변 캐시에 저장하지 않음)
+    """
+    if search_mode == "simple":
+        return await run_in_threadpool(find_simple_concepts, question, k), [], False
+    
+    keywords, keywords_ok = await extract_keywords_cached(question)
+    degraded = not keywords_ok
+    print(f"🔍 추출된 키워드: {keywords}")
+    concepts = await run_in_threadpool(embedder.find_candidates, graph, keywords, k)
+    
+    if embedder.needs_rerank(concepts, k):
+        # 질문 + 모든 라벨 임베딩을 한 번의 MGET / 파이프라인으로 처리
+        embs = await embedder.get_embeddings_cached(
+            [question] + [c['label'] for c in concepts], cache, CACHE_TTL["embedding"]
         )
-        resp.raise_for_status()
-        return resp.json().get("response", "")
+        query_emb, label_embs = embs[0], embs[1:]
+        if query_emb:
+            concepts = embedder.rerank(query_emb, concepts, label_embs, k)
+        # 질문 임베딩 실패로 재순위 생략 / 일부 라벨 임베딩 실패로 부정확한 재순위
+        degraded = degraded or not query_emb or not all(label_embs)
+    
+    return concepts[:k*2], keywords, degraded
+
+async def search_graph_cached(
+    question: str, 
+    k: int = 8,
+    search_mode: str = "hybrid",
+    include_neighbors: bool = True,
+    max_hops: int = 2
+) -> Dict:
+    """그래프 검색 컨텍스트 (캐시 우선)"""
+    key_data = json.dumps([question, k, search_mode, include_neighbors, max_hops], ensure_ascii=False)
+    context = await cache.get("search", key_data)
+    if context is not None:
+        return context
+    
+    concepts, keywords, degraded = await resolve_concepts(question, k, search_mode)
+    context = await run_in_threadpool(
+        search_graph_improved,
+        question, k, search_mode, include_neighbors, max_hops,
+        concepts, keywords
+    )
+    if degraded:
+        # Ollama 일시 장애로 낮아진 품질이 캐시 TTL 동안 고정되지 않도록 저장하지 않음
+        context["degraded"] = True
+    else:
+        await cache.set("search", key_data, context, CACHE_TTL["search"])
+    return context
+
+async def call_llm_cached(prompt: str, temperature: float = 0.7, store: bool = True) -> str:
+    """
+    LLM 호출 (캐시 우선, 실패 응답은 캐싱하지 않음)
+    store=False: 품질이 낮아진 컨텍스트로 만든 프롬프트 - 조회만 하고 저장하지 않음
+    """
+    key_data = f"{LLM_MODEL}|{temperature}|{prompt}"
+    answer = await cache.get("llm_response", key_data)
+    if answer is not None:
+        return answer
+    
+    try:
+        answer = await run_in_threadpool(_generate, prompt, temperature)
     except Exception as e:
         return f"LLM 응답 생성 실패: {str(e)}"
+    if store:
+        await cache.set("llm_response", key_data, answer, CACHE_TTL["llm_response"])
+    return answer
+
+def _log_params(req: ChatRequest) -> Dict:
+    return {
+        "k": req.k,
+        "search_mode": req.search_mode,
+        "include_neighbors": req.include_neighbors,
+        "max_hops": req.max_hops
+    }
 
 @app.post("/chat")
-def chat(req: ChatRequest):
+async def chat(req: ChatRequest):
     """개선된 채팅 엔드포인트"""
     try:
         # 1. 그래프 검색
-        context = search_graph_improved(
+        context = await search_graph_cached(
             req.query, 
             req.k,
             req.search_mode,
@@ -312,9 +648,10 @@ def chat(req: ChatRequest):
         # 2. 프롬프트 구성
         keywords = context.get("keywords", [])
         prompt = build_enhanced_prompt(req.query, context, keywords)
+        query_log.record(req.query, keywords, endpoint="chat", **_log_params(req))
         
         # 3. LLM 응답 생성
-        answer = call_llm(prompt)
+        answer = await call_llm_cached(prompt, store=not context.get("degraded"))
         
         return {
             "answer": answer,
@@ -326,20 +663,22 @@ def chat(req: ChatRequest):
         raise HTTPException(status_code=500, detail=f"처리 중 오류 발생: {str(e)}")
 
 @app.post("/search")
-def search_only(req: ChatRequest):
+async def search_only(req: ChatRequest):
     """검색만 수행 (LLM 호출 없음)"""
     try:
-        context = search_graph_improved(
+        context = await search_graph_cached(
             req.query, 
             req.k,
             req.search_mode,
             req.include_neighbors,
             req.max_hops
         )
+        query_log.record(req.query, context.get("keywords", []), endpoint="search", **_log_params(req))
         return context
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"검색 중 오류 발생: {str(e)}")
 
 if __name__ == "__main__":
+    # 개발용 단일 프로세스 실행 (운영: gunicorn -c gunicorn.conf.py main:app)
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
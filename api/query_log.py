@@ -0,0 +1,161 @@
+"""
+질의 로그 기록 모듈
+API로 들어온 질문과 추출된 키워드를 로컬 JSONL 파일에 남겨
+캐시 워밍업 시 자주 묻는 질문을 재생할 수 있도록 합니다.
+
+기록은 큐에 넣기만 하고 별도 스레드가 모아서 파일에 쓰므로 이벤트 루프를 막지 않으며,
+파일이 max_bytes를 넘으면 <path>.1로 교체(1세대 보관)하여 크기가 제한됩니다.
+"""
+import os
+import json
+import time
+import queue
+import threading
+from collections import Counter, deque
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 회전 잠금 없음
+    fcntl = None
+
+class QueryLog:
+    def __init__(self, path: str, max_lines: int = 100000, max_bytes: int = 20 << 20, queue_size: int = 10000):
+        """
+        Args:
+            max_lines: 집계 시 사용할 최근 로그 줄 수
+            max_bytes: 로그 파일 최대 크기 (넘으면 <path>.1로 회전)
+            queue_size: 쓰기 대기 큐 크기 (가득 차면 기록 생략)
+        """
+        self.path = path
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.dropped = 0
+
+    def record(
+        self,
+        query: str,
+        keywords: Optional[List[str]] = None,
+        endpoint: str = "chat",
+        **params
+    ):
+        """질의 한 건 기록 요청 (블로킹 없음, 실패해도 요청 처리에는 영향 없음)"""
+        entry = {
+            "ts": time.time(),
+            "endpoint": endpoint,
+            "query": query,
+            "keywords": keywords or [],
+            "params": params
+        }
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(json.dumps(entry, ensure_ascii=False) + "\n")
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_writer(self):
+        """쓰기 스레드 시작 (fork 이후 워커에서 첫 기록 시)"""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="query-log-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            lines = [self._queue.get()]
+            # 쌓인 항목을 한 번에 기록
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in lines
+            lines = [line for line in lines if line is not None]
+            try:
+                if lines:
+                    self._append(lines)
+            except Exception as e:
+                print(f"Query log write error: {e}")
+            if stop:
+                return
+
+    def _append(self, lines: List[str]):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            size = f.tell()
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        """<path> → <path>.1 교체 (여러 워커가 동시에 회전하지 않도록 파일 잠금 후 크기 재확인)"""
+        with open(self.path + ".lock", "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if os.path.getsize(self.path) >= self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+            except FileNotFoundError:
+                pass
+
+    def close(self, timeout: float = 5.0):
+        """대기 중인 기록을 모두 쓰고 쓰기 스레드 종료"""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout)
+
+    def _read_recent(self) -> List[Dict]:
+        """최근 max_lines개의 로그 항목 읽기 (회전된 이전 파일 포함, 최대 2 × max_bytes)"""
+        lines = deque(maxlen=self.max_lines)
+        for path in (self.path + ".1", self.path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    lines.extend(f)
+            except FileNotFoundError:
+                continue
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # 중간에 잘린 줄은 무시
+        return entries
+
+    def top_queries(self, n: int, entries: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        가장 자주 들어온 질문 상위 n개
+
+        Returns:
+            [{"query", "endpoint", "params", "count"}] - params는 가장 최근 요청 기준
+        """
+        counts = Counter()
+        latest = {}
+        for e in self._read_recent() if entries is None else entries:
+            key = (e.get("endpoint", "chat"), e.get("query", ""))
+            if not key[1]:
+                continue
+            counts[key] += 1
+            latest[key] = e.get("params", {})
+
+        return [
+            {"endpoint": endpoint, "query": query, "params": latest[(endpoint, query)], "count": cnt}
+            for (endpoint, query), cnt in counts.most_common(n)
+        ]
+
+    def top_keywords(self, n: int, entries: Optional[List[Dict]] = None) -> List[str]:
+        """가장 자주 추출된 키워드 상위 n개"""
+        counts = Counter()
+        for e in self._read_recent() if entries is None else entries:
+            counts.update(e.get("keywords", []))
+        return [kw for kw, _ in counts.most_common(n)]
+
+    def summarize(self, n: int) -> Tuple[List[Dict], List[str]]:
+        """로그를 한 번만 읽어 상위 질문과 키워드를 함께 집계 (워밍업용, 스레드에서 호출)"""
+        entries = self._read_recent()
+        return self.top_queries(n, entries), self.top_keywords(n, entries)
@@ -0,0 +1,141 @@
+"""
+캐시 직렬화 모듈
+prefix별로 직렬화 방식을 선택하여 Redis 메모리와 파싱 비용을 줄입니다.
+- 임베딩: little-endian float32 (옵션: float16) 원시 바이트
+- 구조화된 컨텍스트: msgpack (미설치 시 JSON)
+- 일정 크기 이상의 구조화된 값은 zstd 압축 (설치된 경우)
+
+저장 형식: [태그 1바이트][페이로드]
+압축된 값은 [ZSTD 태그][원래 태그][압축된 페이로드] 형식입니다.
+태그가 없는 값은 이전 버전의 JSON 텍스트로 간주합니다.
+"""
+import os
+import json
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+TAG_ZSTD = 0x10
+
+class Serializer:
+    """직렬화 방식 기본 클래스"""
+    tag: int = 0
+    compressible: bool = True  # 압축 이득이 없는 형식은 False
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+class JsonSerializer(Serializer):
+    tag = 0x01
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+class MsgpackSerializer(Serializer):
+    tag = 0x02
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+class VectorSerializer(Serializer):
+    """float 벡터를 little-endian 원시 바이트로 저장"""
+    compressible = False  # 부동소수 가수는 압축률이 낮아 CPU만 소모
+
+    def __init__(self, dtype: str = "float32"):
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.dtype = "<f4" if dtype == "float32" else "<f2"
+        self.tag = 0x03 if dtype == "float32" else 0x04
+
+    def dumps(self, value: Any) -> bytes:
+        import numpy as np  # 시작 시간 단축을 위해 첫 사용 시 로드
+        return np.asarray(value, dtype=self.dtype).tobytes()
+
+    def loads(self, data: bytes) -> Any:
+        import numpy as np
+        return np.frombuffer(data, dtype=self.dtype).astype(np.float64).tolist()
+
+class CacheCodec:
+    """prefix별 직렬화 + 선택적 압축"""
+
+    def __init__(
+        self,
+        serializers: Optional[Dict[str, Serializer]] = None,
+        default: Optional[Serializer] = None,
+        compress_threshold: int = 0,
+        compress_level: int = 3
+    ):
+        """
+        Args:
+            serializers: prefix -> Serializer 매핑
+            default: 매핑에 없는 prefix에 사용할 Serializer
+            compress_threshold: 이 바이트 수 이상이면 zstd 압축 (0이면 압축 안 함)
+        """
+        self.serializers = serializers or {}
+        self.default = default or JsonSerializer()
+        self.compress_threshold = compress_threshold if ZSTD_AVAILABLE else 0
+        # 태그 -> Serializer (디코딩 시 저장 당시 방식을 찾기 위함)
+        self._by_tag = {s.tag: s for s in [self.default, *self.serializers.values()]}
+        self._by_tag.setdefault(JsonSerializer.tag, JsonSerializer())
+        if MSGPACK_AVAILABLE:
+            self._by_tag.setdefault(MsgpackSerializer.tag, MsgpackSerializer())
+        for dtype in ("float32", "float16"):
+            vs = VectorSerializer(dtype)
+            self._by_tag.setdefault(vs.tag, vs)
+        if ZSTD_AVAILABLE:
+            self._compressor = zstandard.ZstdCompressor(level=compress_level)
+            self._decompressor = zstandard.ZstdDecompressor()
+        else:
+            self._compressor = self._decompressor = None
+
+    @classmethod
+    def from_env(cls) -> "CacheCodec":
+        """환경 변수 기반 기본 구성"""
+        embedding_dtype = os.getenv("CACHE_EMBEDDING_DTYPE", "float32")
+        threshold = int(os.getenv("CACHE_COMPRESS_THRESHOLD", "2048"))
+        structured = MsgpackSerializer() if MSGPACK_AVAILABLE else JsonSerializer()
+        return cls(
+            serializers={"embedding": VectorSerializer(embedding_dtype)},
+            default=structured,
+            compress_threshold=threshold
+        )
+
+    def encode(self, prefix: str, value: Any) -> bytes:
+        serializer = self.serializers.get(prefix, self.default)
+        payload = serializer.dumps(value)
+        if (self.compress_threshold and serializer.compressible
+                and len(payload) >= self.compress_threshold):
+            return bytes((TAG_ZSTD, serializer.tag)) + self._compressor.compress(payload)
+        return bytes((serializer.tag,)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        tag = data[0]
+        if tag == TAG_ZSTD:
+            if self._decompressor is None:
+                raise ValueError("zstd-compressed cache value but zstandard is not installed")
+            if data[1] not in self._by_tag:
+                raise ValueError(f"Unknown cache serializer tag: {data[1]:#x}")
+            return self._by_tag[data[1]].loads(self._decompressor.decompress(data[2:]))
+        if tag in self._by_tag:
+            return self._by_tag[tag].loads(data[1:])
+        # 태그 없는 이전 JSON 텍스트 값
+        return json.loads(data)
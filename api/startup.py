@@ -0,0 +1,101 @@
+"""
+시작 상태 추적 모듈
+Neo4j / Redis / Ollama 연결과 무거운 모듈 로딩을 백그라운드에서 동시에 재시도하며,
+구성요소별 준비 상태와 프로세스 시작부터 최초 ready까지 걸린 시간을 기록합니다.
+의존 서비스가 늦게 뜨더라도 컨테이너가 즉시 죽지 않고 liveness는 유지됩니다.
+"""
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+class StartupTracker:
+    def __init__(self, required: Iterable[str], started_at: Optional[float] = None):
+        """
+        Args:
+            required: 모두 ready가 되어야 서비스가 ready로 보고되는 구성요소 이름
+            started_at: 프로세스 시작 시각 (time.time(), 없으면 지금)
+        """
+        self.required = set(required)
+        self.started_at = started_at or time.time()
+        self.components: Dict[str, Dict] = {}
+        self.time_to_ready_sec: Optional[float] = None
+
+    def reset(self, started_at: Optional[float] = None):
+        """측정 기준 시각 재설정 (preload 후 fork된 워커는 fork 시각부터 측정)"""
+        self.started_at = started_at or time.time()
+        self.components = {}
+        self.time_to_ready_sec = None
+
+    def _elapsed(self) -> float:
+        return round(time.time() - self.started_at, 3)
+
+    def mark(self, name: str, state: str, error: Optional[str] = None):
+        """구성요소 상태 기록 (pending / connecting / ready / failed)"""
+        entry = self.components.setdefault(name, {"attempts": 0})
+        entry["state"] = state
+        entry["error"] = error
+        if state == "ready" and "ready_after_sec" not in entry:
+            entry["ready_after_sec"] = self._elapsed()
+        if self.ready and self.time_to_ready_sec is None:
+            self.time_to_ready_sec = self._elapsed()
+            print(f"🚀 Service ready in {self.time_to_ready_sec:.2f}s")
+
+    def is_ready(self, name: str) -> bool:
+        return self.components.get(name, {}).get("state") == "ready"
+
+    @property
+    def ready(self) -> bool:
+        return all(self.is_ready(name) for name in self.required)
+
+    async def run_component(
+        self,
+        name: str,
+        start: Callable[[], Awaitable],
+        retry_base: float = 1.0,
+        retry_max: float = 30.0
+    ):
+        """start()가 성공할 때까지 지수 백오프로 재시도"""
+        delay = retry_base
+        self.mark(name, "pending")
+        while True:
+            self.components[name]["attempts"] += 1
+            self.mark(name, "connecting", self.components[name].get("error"))
+            try:
+                await start()
+                self.mark(name, "ready")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.mark(name, "failed", str(e))
+                print(f"⚠️ {name} not ready ({e}). Retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, retry_max)
+
+    async def monitor(self, name: str, probe: Callable[[], Awaitable], interval: float = 10.0):
+        """
+        준비된 구성요소를 주기적으로 다시 확인하여 현재 상태 반영
+        (시작 후 장애가 나면 failed → readiness 503, 복구되면 다시 ready)
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # 응답 없는 의존 서비스도 장애로 판단
+                await asyncio.wait_for(probe(), timeout=max(interval, 5.0))
+                if not self.is_ready(name):
+                    print(f"✅ {name} recovered")
+                self.mark(name, "ready")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.is_ready(name):
+                    print(f"⚠️ {name} became unavailable: {e}")
+                self.mark(name, "failed", str(e) or type(e).__name__)
+
+    def report(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "uptime_sec": self._elapsed(),
+            "time_to_ready_sec": self.time_to_ready_sec,
+            "components": self.components
+        }
@@ -1,15 +1,26 @@
-import os, gzip, requests, time
+import os, gzip, json, time, zlib
 from tqdm import tqdm
 from py2neo import Graph
 from urllib.parse import unquote
 
+from export_snapshot import export_snapshot
+from downloader import SegmentedDownloader
+
 neo4j_uri = os.environ.get("NEO4J_URI","bolt://neo4j:7687")
 neo4j_user = os.environ.get("NEO4J_USER","neo4j")
 neo4j_pwd  = os.environ.get("NEO4J_PASSWORD","neo4j")
+redis_url  = os.environ.get("REDIS_URL")
+
+# API 캐시 키에 포함되는 그래프 세대 번호 (api/cache_manager.py와 동일한 키)
+GRAPH_VERSION_KEY = "graphrag:graph_version"
 
-CONCEPTNET_URL = "https://s3.amazonaws.com/conceptnet/downloads/2019/edges/conceptnet-assertions-5.7.0.csv.gz"
+CONCEPTNET_URL = os.environ.get("CONCEPTNET_URL", "https://s3.amazonaws.com/conceptnet/downloads/2019/edges/conceptnet-assertions-5.7.0.csv.gz")
 DATA_DIR = os.environ.get("DATA_DIR", "/data")
 CONCEPTNET_FILE = os.path.join(DATA_DIR, "conceptnet-assertions-5.7.0.csv.gz")
+# 이번 적재 실행 식별자: 관계 가중치를 실행마다 새로 합산하여 재실행해도 중복 누적되지 않음
+BUILD_ID = time.time_ns()
+# API 워커들이 메모리 매핑하는 그래프 스냅샷 위치
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(DATA_DIR, "snapshot"))
 
 # Neo4j 연결 (재시도 로직 추가)
 def connect_neo4j(max_retries=10, retry_delay=5):
@@ -38,29 +49,13 @@ graph.run("CREATE CONSTRAINT IF NOT EXISTS FOR (c:Concept) REQUIRE c.uri IS UNIQ
 graph.run("CREATE INDEX IF NOT EXISTS FOR (c:Concept) ON (c.language);")
 graph.run("CREATE INDEX IF NOT EXISTS FOR (c:Concept) ON (c.label);")
 
+def conceptnet_downloader():
+    """ConceptNet 덤프 다운로더 (CONCEPTNET_DOWNLOAD_WORKERS / CONCEPTNET_SEGMENT_MB / CONCEPTNET_SHA256)"""
+    return SegmentedDownloader.from_env(CONCEPTNET_URL, CONCEPTNET_FILE)
+
 def download_conceptnet():
-    """ConceptNet 데이터 다운로드"""
-    if os.path.exists(CONCEPTNET_FILE):
-        print(f"✅ ConceptNet file already exists: {CONCEPTNET_FILE}")
-        return
-    
-    print(f"📥 Downloading ConceptNet from {CONCEPTNET_URL}...")
-    os.makedirs(DATA_DIR, exist_ok=True)
-    
-    response = requests.get(CONCEPTNET_URL, stream=True)
-    total_size = int(response.headers.get('content-length', 0))
-    
-    with open(CONCEPTNET_FILE, 'wb') as f, tqdm(
-        desc="Downloading",
-        total=total_size,
-        unit='B',
-        unit_scale=True
-    ) as pbar:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
-            pbar.update(len(chunk))
-    
-    print(f"✅ Download complete: {CONCEPTNET_FILE}")
+    """ConceptNet 데이터 다운로드 (병렬 구간 다운로드, 이어받기, 크기/체크섬 검증)"""
+    conceptnet_downloader().download()
 
 def parse_conceptnet_uri(uri):
     """ConceptNet URI 파싱 (/c/ko/개 -> language=ko, label=개)"""
@@ -71,8 +66,11 @@ def parse_conceptnet_uri(uri):
         return language, label
     return None, None
 
-def load_korean_concepts():
-    """ConceptNet에서 한국어 관계만 Neo4j에 로드"""
+def load_korean_concepts(source=None):
+    """
+    ConceptNet에서 한국어 관계만 Neo4j에 로드
+    source: gzip 바이너리 스트림 (다운로드 중인 스트림 포함, None이면 CONCEPTNET_FILE)
+    """
     print("📊 Loading Korean concepts from ConceptNet...")
     
     batch_size = 1000
@@ -80,54 +78,59 @@ def load_korean_concepts():
     total_loaded = 0
     skipped = 0
     
-    with gzip.open(CONCEPTNET_FILE, 'rt', encoding='utf-8') as f:
-        for line in tqdm(f, desc="Processing ConceptNet"):
-            try:
-                parts = line.strip().split('\t')
-                if len(parts) < 4:
-                    continue
+    try:
+        with gzip.open(source or CONCEPTNET_FILE, 'rt', encoding='utf-8') as f:
+            for line in tqdm(f, desc="Processing ConceptNet"):
+                try:
+                    parts = line.strip().split('\t')
+                    if len(parts) < 4:
+                        continue
                 
-                rel_uri, start_uri, end_uri = parts[0], parts[1], parts[2]
+                    rel_uri, start_uri, end_uri = parts[0], parts[1], parts[2]
                 
-                # weight 파싱 (숫자가 아닌 경우 기본값 1.0)
-                try:
-                    weight = float(parts[3])
-                except (ValueError, IndexError):
-                    weight = 1.0
+                    # weight 파싱 (숫자가 아닌 경우 기본값 1.0)
+                    try:
+                        weight = float(parts[3])
+                    except (ValueError, IndexError):
+                        weight = 1.0
                 
-                # 시작/끝 개념의 언어 파싱
-                start_lang, start_label = parse_conceptnet_uri(start_uri)
-                end_lang, end_label = parse_conceptnet_uri(end_uri)
+                    # 시작/끝 개념의 언어 파싱
+                    start_lang, start_label = parse_conceptnet_uri(start_uri)
+                    end_lang, end_label = parse_conceptnet_uri(end_uri)
                 
-                # 한국어 관계만 필터링 (시작 또는 끝이 한국어)
-                if start_lang != 'ko' and end_lang != 'ko':
-                    continue
+                    # 한국어 관계만 필터링 (시작 또는 끝이 한국어)
+                    if start_lang != 'ko' and end_lang != 'ko':
+                        continue
                 
-                # 관계 타입 추출 (/r/RelatedTo -> RelatedTo)
-                rel_type = rel_uri.split('/')[-1] if '/' in rel_uri else rel_uri
+                    # 관계 타입 추출 (/r/RelatedTo -> RelatedTo)
+                    rel_type = rel_uri.split('/')[-1] if '/' in rel_uri else rel_uri
                 
-                batch.append({
-                    'start_uri': start_uri,
-                    'start_label': start_label,
-                    'start_lang': start_lang,
-                    'end_uri': end_uri,
-                    'end_label': end_label,
-                    'end_lang': end_lang,
-                    'rel_type': rel_type,
-                    'weight': weight
-                })
+                    batch.append({
+                        'start_uri': start_uri,
+                        'start_label': start_label,
+                        'start_lang': start_lang,
+                        'end_uri': end_uri,
+                        'end_label': end_label,
+                        'end_lang': end_lang,
+                        'rel_type': rel_type,
+                        'weight': weight
+                    })
                 
-                # 배치 처리
-                if len(batch) >= batch_size:
-                    insert_batch(batch)
-                    total_loaded += len(batch)
-                    batch = []
+                    # 배치 처리
+                    if len(batch) >= batch_size:
+                        insert_batch(batch)
+                        total_loaded += len(batch)
+                        batch = []
             
-            except Exception as e:
-                skipped += 1
-                if skipped <= 10:  # 처음 10개 에러만 출력
-                    print(f"⚠️ Skipping line due to error: {e}")
-                continue
+                except Exception as e:
+                    skipped += 1
+                    if skipped <= 10:  # 처음 10개 에러만 출력
+                        print(f"⚠️ Skipping line due to error: {e}")
+                    continue
+    except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+        # 잘린/손상된 덤프: 부분 적재 상태로 통계·스냅샷을 만들지 않도록 중단
+        print(f"❌ ConceptNet dump is truncated or corrupt after {total_loaded} relations: {e}")
+        raise RuntimeError(f"Corrupt ConceptNet dump: {e}") from e
     
     # 남은 배치 처리
     if batch:
@@ -139,7 +142,11 @@ def load_korean_concepts():
         print(f"⚠️ Skipped {skipped} lines due to parsing errors")
 
 def insert_batch(batch):
-    """배치 단위로 Neo4j에 삽입"""
+    """
+    배치 단위로 Neo4j에 삽입
+    같은 관계가 여러 줄에 나오면 가중치를 합산하되, 이번 실행(BUILD_ID)에서 처음 만난 관계는
+    이전 실행의 값을 덮어쓰므로 실패 후 재실행해도 가중치가 중복 누적되지 않습니다.
+    """
     query = """
     UNWIND $batch AS row
     MERGE (start:Concept {uri: row.start_uri})
@@ -147,13 +154,104 @@ def insert_batch(batch):
     MERGE (end:Concept {uri: row.end_uri})
     ON CREATE SET end.label = row.end_label, end.language = row.end_lang
     MERGE (start)-[r:RELATED {type: row.rel_type}]->(end)
-    ON CREATE SET r.weight = row.weight
-    ON MATCH SET r.weight = r.weight + row.weight
+    SET r.weight = CASE WHEN r.build_id = $build_id THEN r.weight + row.weight ELSE row.weight END,
+        r.build_id = $build_id
     """
-    graph.run(query, batch=batch)
+    graph.run(query, batch=batch, build_id=BUILD_ID)
+
+def compute_graph_stats():
+    """
+    빌드 시점 그래프 통계 계산 (API /stats에서 실시간으로 계산하기엔 비싼 항목 포함)
+    - 언어별 개념 수, 관계 타입별 엣지 수
+    - 차수 분포 (log2 구간), 가중치 분위수
+    """
+    concepts_by_language = graph.run("""
+        MATCH (c:Concept)
+        RETURN c.language as lang, count(*) as cnt
+        ORDER BY cnt DESC
+        """).data()
+    
+    relations_by_type = graph.run("""
+        MATCH ()-[r:RELATED]->()
+        RETURN r.type as rel_type, count(*) as cnt
+        ORDER BY cnt DESC
+        """).data()
+    
+    # 차수 구간: 0, 1, 2-3, 4-7, 8-15, ...
+    degree_buckets = graph.run("""
+        MATCH (c:Concept)
+        WITH COUNT { (c)-[:RELATED]-() } as deg
+        WITH CASE WHEN deg = 0 THEN 0 ELSE toInteger(floor(log(deg) / log(2))) + 1 END as bucket
+        RETURN bucket, count(*) as cnt
+        ORDER BY bucket
+        """).data()
+    degree_histogram = [
+        {
+            "degree": "0" if b["bucket"] == 0 else f"{2 ** (b['bucket'] - 1)}-{2 ** b['bucket'] - 1}",
+            "cnt": b["cnt"]
+        }
+        for b in degree_buckets
+    ]
+    
+    weights = graph.run("""
+        MATCH ()-[r:RELATED]->()
+        RETURN min(r.weight) as min, avg(r.weight) as mean,
+               percentileCont(r.weight, 0.25) as p25,
+               percentileCont(r.weight, 0.5) as p50,
+               percentileCont(r.weight, 0.75) as p75,
+               percentileCont(r.weight, 0.9) as p90,
+               percentileCont(r.weight, 0.99) as p99,
+               max(r.weight) as max
+        """).data()[0]
+    
+    return {
+        "total_concepts": sum(row["cnt"] for row in concepts_by_language),
+        "total_relations": sum(row["cnt"] for row in relations_by_type),
+        "concepts_by_language": concepts_by_language,
+        "relations_by_type": relations_by_type,
+        "degree_histogram": degree_histogram,
+        "weight_quantiles": weights
+    }
+
+def write_graph_stats():
+    """통계를 (:GraphStats {key: 'current'}) 노드에 JSON으로 저장"""
+    print("📈 Computing graph statistics...")
+    stats = compute_graph_stats()
+    stats["built_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    graph.run("""
+        MERGE (s:GraphStats {key: 'current'})
+        SET s.payload = $payload, s.built_at = datetime()
+        """, payload=json.dumps(stats, ensure_ascii=False))
+    print(f"✅ Graph stats saved: {stats['total_concepts']} concepts, {stats['total_relations']} relations")
+
+def bump_graph_version():
+    """그래프 세대 번호 증가 → API의 그래프 의존 캐시(검색/답변/통계)가 한 번에 무효화됨"""
+    if not redis_url:
+        print("⚠️ REDIS_URL not set. Skipping graph version bump.")
+        return
+    
+    try:
+        import redis
+        client = redis.Redis.from_url(redis_url)
+        version = client.incr(GRAPH_VERSION_KEY)
+        print(f"✅ Graph version bumped to v{version}")
+    except Exception as e:
+        print(f"⚠️ Graph version bump failed: {e}. API caches may serve stale contexts until TTL expiry.")
 
 # 실행
 if __name__ == "__main__":
-    download_conceptnet()
-    load_korean_concepts()
+    downloader = conceptnet_downloader()
+    if downloader.sha256:
+        # 체크섬 지정 시: 검증을 통과한 파일만 적재
+        downloader.download()
+        load_korean_concepts()
+    else:
+        # 다운로드하면서 앞부분부터 압축 해제·적재 (완료 후 크기 검증 통과 시 최종 파일로 교체)
+        # 도중에 실패하면 Neo4j에는 그때까지의 관계가 남으며, 다음 실행이 모든 가중치를 다시 씀
+        with downloader.open_stream() as stream:
+            load_korean_concepts(stream)
+    write_graph_stats()
+    # 스냅샷을 먼저 교체해야 세대 변경을 감지한 API 워커가 새 스냅샷을 매핑함
+    export_snapshot(graph, SNAPSHOT_DIR)
+    bump_graph_version()
     print("✅ Graph build finished.")
@@ -0,0 +1,426 @@
+"""
+대용량 덤프 다운로더 (ConceptNet)
+HTTP Range 구간을 여러 스레드로 병렬 다운로드하여 <dest>.part에 기록하고,
+구간별 진행 상황을 <dest>.part.json에 저장해 중단된 다운로드를 이어받습니다.
+크기(와 지정 시 SHA-256) 검증을 통과해야만 <dest>로 원자적으로 이름을 바꿉니다.
+
+다운로드 중에도 파일 앞부분부터 연속으로 받은 바이트를 읽는 스트림을 제공하므로
+압축 해제·파싱을 다운로드와 겹쳐 진행할 수 있습니다. (구간은 앞에서부터 순서대로 할당)
+"""
+import io
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+class DownloadError(Exception):
+    pass
+
+class SegmentedDownloader:
+    def __init__(
+        self,
+        url: str,
+        dest: str,
+        workers: int = 4,
+        segment_size: int = 16 << 20,
+        sha256: Optional[str] = None,
+        timeout: Tuple[float, float] = (10.0, 60.0),
+        max_retries: int = 5,
+        chunk_size: int = 256 << 10,
+        save_interval: float = 2.0
+    ):
+        """
+        Args:
+            workers: 동시 다운로드 스레드 수
+            segment_size: Range 요청 구간 크기 (작을수록 스트림 읽기가 고르게 진행됨)
+            sha256: 기대 체크섬 (hex, None이면 크기만 검증)
+            timeout: (연결, 읽기) 타임아웃 (초)
+            max_retries: 구간별 연속 실패 허용 횟수 (진행이 있으면 초기화)
+            save_interval: 진행 상황 파일 저장 최소 간격 (초)
+        """
+        self.url = url
+        self.dest = dest
+        self.part_path = dest + ".part"
+        self.state_path = dest + ".part.json"
+        self.meta_path = dest + ".json"
+        self.workers = max(1, workers)
+        self.segment_size = max(1, segment_size)
+        self.sha256 = sha256.lower() if sha256 else None
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.chunk_size = chunk_size
+        self.save_interval = save_interval
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.size: Optional[int] = None
+        self.ranged = False
+        self.validator: Optional[str] = None
+        self.segments: List[Dict] = []
+
+        self._cond = threading.Condition()
+        self._save_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._next = 0
+        self._error: Optional[BaseException] = None
+        self._fd: Optional[int] = None
+        self._last_save = 0.0
+        self._pbar = None
+
+    @classmethod
+    def from_env(cls, url: str, dest: str) -> "SegmentedDownloader":
+        return cls(
+            url,
+            dest,
+            workers=int(os.environ.get("CONCEPTNET_DOWNLOAD_WORKERS", "4")),
+            segment_size=int(os.environ.get("CONCEPTNET_SEGMENT_MB", "16")) << 20,
+            sha256=os.environ.get("CONCEPTNET_SHA256") or None
+        )
+
+    # ---------- 원격 파일 정보 ----------
+
+    def _probe(self):
+        """크기, Range 지원 여부, 변경 감지용 ETag/Last-Modified 확인"""
+        with self.session.get(self.url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.timeout) as resp:
+            resp.raise_for_status()
+            self.validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+            content_range = resp.headers.get("Content-Range", "")
+            if resp.status_code == 206 and "/" in content_range and not content_range.endswith("/*"):
+                self.size = int(content_range.rsplit("/", 1)[1])
+                self.ranged = True
+            else:
+                length = resp.headers.get("Content-Length")
+                self.size = int(length) if length else None
+                self.ranged = False
+
+    # ---------- 완료 파일 확인 ----------
+
+    def _file_sha256(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(8 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def is_complete(self) -> bool:
+        """최종 파일이 이미 있고 크기/체크섬이 맞는지 (아니면 삭제 후 다시 받음)"""
+        if not os.path.exists(self.dest):
+            return False
+
+        actual = os.path.getsize(self.dest)
+        meta = {}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        expected = meta.get("size")
+        if expected is None:
+            # 이전 버전이 받은 파일: 원격 크기와 비교 (오프라인이면 그대로 사용)
+            try:
+                self._probe()
+                expected = self.size
+            except requests.RequestException as e:
+                print(f"⚠️ Cannot verify {self.dest} ({e}). Using it as is.")
+                return True
+
+        ok = expected is None or actual == expected
+        if ok and self.sha256:
+            ok = (meta.get("sha256") or self._file_sha256(self.dest)) == self.sha256
+        if not ok:
+            print(f"⚠️ {self.dest} is incomplete or corrupt ({actual} bytes, expected {expected}). Re-downloading.")
+            os.remove(self.dest)
+            if os.path.exists(self.meta_path):
+                os.remove(self.meta_path)
+        return ok
+
+    # ---------- 진행 상황 ----------
+
+    def _load_state(self) -> Optional[Dict]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _persist(self, segments: List[Dict]):
+        """데이터를 디스크에 내린 뒤 진행 상황 저장 (기록된 바이트보다 앞서 나가지 않도록)"""
+        if not self._save_lock.acquire(blocking=False):
+            return
+        try:
+            if self._fd is not None:
+                os.fsync(self._fd)
+            tmp = self.state_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": self.url,
+                    "size": self.size,
+                    "validator": self.validator,
+                    "segments": segments
+                }, f)
+            os.replace(tmp, self.state_path)
+        finally:
+            self._save_lock.release()
+
+    def _snapshot(self) -> List[Dict]:
+        return [dict(seg) for seg in self.segments]
+
+    def _remaining(self, seg: Dict) -> bool:
+        return seg["end"] is None or seg["start"] + seg["done"] < seg["end"]
+
+    def _contiguous(self) -> int:
+        """파일 앞에서부터 빈틈없이 받은 바이트 수"""
+        pos = 0
+        for seg in self.segments:
+            pos = seg["start"] + seg["done"]
+            if self._remaining(seg):
+                break
+        return pos
+
+    def _finished(self) -> bool:
+        return not any(self._remaining(seg) for seg in self.segments)
+
+    # ---------- 다운로드 ----------
+
+    def start(self):
+        """원격 파일을 확인하고 (이어받을 수 있으면 이어서) 백그라운드 다운로드 시작"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.dest)), exist_ok=True)
+        self._probe()
+
+        state = self._load_state()
+        resumable = (
+            self.ranged
+            and state is not None
+            and state.get("url") == self.url
+            and state.get("size") == self.size
+            and state.get("validator") == self.validator
+            and os.path.exists(self.part_path)
+            and os.path.getsize(self.part_path) == self.size
+        )
+        if resumable:
+            self.segments = state["segments"]
+            print(f"♻️ Resuming download of {self.url}: "
+                  f"{sum(s['done'] for s in self.segments) / (1 << 20):.1f} MB already on disk")
+        elif self.ranged:
+            self.segments = [
+                {"start": start, "end": min(start + self.segment_size, self.size), "done": 0}
+                for start in range(0, self.size, self.segment_size)
+            ]
+        else:
+            # Range 미지원 서버: 단일 스트림 (이어받기 불가)
+            self.segments = [{"start": 0, "end": None, "done": 0}]
+            print("⚠️ Server does not support range requests. Downloading in a single stream.")
+
+        self._fd = os.open(self.part_path, os.O_RDWR | os.O_CREAT | (0 if resumable else os.O_TRUNC), 0o644)
+        if self.ranged:
+            os.ftruncate(self._fd, self.size)
+        self._persist(self._snapshot())
+
+        done = sum(s["done"] for s in self.segments)
+        self._pbar = tqdm(desc="Downloading", total=self.size, initial=done, unit="B", unit_scale=True)
+        pending = sum(1 for s in self.segments if self._remaining(s))
+        print(f"📥 Downloading {self.url} with {min(self.workers, pending)} workers "
+              f"({pending}/{len(self.segments)} segments left)")
+        for _ in range(min(self.workers, pending)):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _claim_segment(self) -> Optional[int]:
+        """아직 받지 않은 구간 중 가장 앞 구간 할당"""
+        with self._cond:
+            while self._next < len(self.segments):
+                idx = self._next
+                self._next += 1
+                if self._remaining(self.segments[idx]):
+                    return idx
+            return None
+
+    def _worker(self):
+        while not self._stop.is_set():
+            idx = self._claim_segment()
+            if idx is None:
+                return
+            try:
+                self._fetch_segment(self.segments[idx])
+            except BaseException as e:
+                with self._cond:
+                    self._error = self._error or e
+                    self._cond.notify_all()
+                self._stop.set()
+                return
+
+    def _fetch_segment(self, seg: Dict):
+        """구간 하나를 받아 .part의 해당 위치에 기록 (실패 시 받은 곳부터 재시도)"""
+        failures = 0
+        while not self._stop.is_set():
+            offset = seg["start"] + seg["done"]
+            headers = {"Range": f"bytes={offset}-{seg['end'] - 1}"} if self.ranged else {}
+            try:
+                with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as resp:
+                    resp.raise_for_status()
+                    if self.ranged and resp.status_code != 206:
+                        raise DownloadError(f"Expected 206 Partial Content, got {resp.status_code}")
+                    for chunk in resp.iter_content(chunk_size=self.chunk_size):
+                        if self._stop.is_set():
+                            return
+                        if seg["end"] is not None:
+                            chunk = chunk[:seg["end"] - offset]
+                        os.pwrite(self._fd, chunk, offset)
+                        offset += len(chunk)
+                        self._advance(seg, len(chunk))
+                        failures = 0
+
+                if seg["end"] is None:
+                    if self.size is not None and offset != self.size:
+                        raise DownloadError(f"Connection closed at byte {offset} (expected {self.size})")
+                    with self._cond:
+                        seg["end"] = offset
+                        self.size = offset
+                        self._cond.notify_all()
+                    return
+                if offset < seg["end"]:
+                    raise DownloadError(f"Connection closed at byte {offset} (segment ends at {seg['end']})")
+                return
+            except (requests.RequestException, DownloadError) as e:
+                failures += 1
+                if failures > self.max_retries:
+                    raise DownloadError(f"Segment {seg['start']}-{seg['end']} failed: {e}") from e
+                if not self.ranged:
+                    with self._cond:
+                        seg["done"] = 0  # 단일 스트림은 처음부터 다시
+                # full jitter 지수 백오프
+                delay = random.uniform(0, min(30.0, 2.0 ** failures))
+                print(f"⚠️ Download error ({e}). Retrying segment at byte {offset} in {delay:.1f}s")
+                self._stop.wait(delay)
+
+    def _advance(self, seg: Dict, n: int):
+        with self._cond:
+            seg["done"] += n
+            self._pbar.update(n)
+            self._cond.notify_all()
+            now = time.monotonic()
+            due = now - self._last_save >= self.save_interval
+            if due:
+                self._last_save = now
+                snapshot = self._snapshot()
+        if due:
+            self._persist(snapshot)
+
+    def wait_for(self, target: int) -> int:
+        """앞에서부터 target 바이트까지 받아질 때까지(또는 다운로드 종료까지) 대기, 받은 바이트 수 반환"""
+        with self._cond:
+            while True:
+                if self._error is not None:
+                    raise DownloadError(f"Download failed: {self._error}") from self._error
+                available = self._contiguous()
+                if available >= target or self._finished():
+                    return available
+                if self._stop.is_set():
+                    raise DownloadError("Download aborted")
+                self._cond.wait(1.0)
+
+    def _close(self):
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._pbar is not None:
+            self._pbar.close()
+            self._pbar = None
+        if self._fd is not None:
+            self._persist(self._snapshot())
+            os.close(self._fd)
+            self._fd = None
+
+    def abort(self):
+        """다운로드 중단 (진행 상황은 남겨 다음 실행에서 이어받음)"""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._close()
+
+    def wait(self):
+        """다운로드 완료 대기 → 크기/체크섬 검증 → <dest>로 원자적 이름 변경"""
+        for thread in self._threads:
+            thread.join()
+        if self._error is not None:
+            self._close()
+            raise DownloadError(f"Download failed: {self._error}") from self._error
+        self._close()
+
+        actual = os.path.getsize(self.part_path)
+        if self.size is not None and actual != self.size:
+            raise DownloadError(f"Size mismatch: {actual} bytes, expected {self.size}")
+        digest = self._file_sha256(self.part_path)
+        if self.sha256 and digest != self.sha256:
+            # 잘못된 데이터로는 이어받을 수 없으므로 처음부터 다시 받도록 정리
+            os.remove(self.part_path)
+            os.remove(self.state_path)
+            raise DownloadError(f"Checksum mismatch: sha256 {digest}, expected {self.sha256}")
+
+        os.replace(self.part_path, self.dest)
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({"url": self.url, "size": actual, "sha256": digest, "validator": self.validator}, f)
+        os.remove(self.state_path)
+        print(f"✅ Download complete: {self.dest} ({actual / (1 << 20):.1f} MB, sha256 {digest[:12]}…)")
+
+    def download(self):
+        """완료될 때까지 다운로드 (이미 검증된 파일이 있으면 생략)"""
+        if self.is_complete():
+            print(f"✅ File already downloaded: {self.dest}")
+            return
+        self.start()
+        self.wait()
+
+    @contextmanager
+    def open_stream(self):
+        """
+        다운로드와 동시에 앞에서부터 읽을 수 있는 바이너리 스트림
+        정상 종료 시 다운로드 완료·검증까지 기다리고, 읽는 쪽에서 예외가 나면 다운로드를 중단합니다.
+        스트림으로 읽은 데이터는 with 블록이 끝나 검증될 때까지 검증되지 않은 상태입니다.
+        (검증 전에 소비하면 안 되는 경우 download() 후 파일을 여세요)
+        """
+        if self.is_complete():
+            print(f"✅ File already downloaded: {self.dest}")
+            with open(self.dest, "rb") as f:
+                yield f
+            return
+
+        self.start()
+        try:
+            with io.BufferedReader(ProgressiveReader(self), buffer_size=1 << 20) as stream:
+                yield stream
+        except BaseException:
+            self.abort()
+            raise
+        self.wait()
+
+class ProgressiveReader(io.RawIOBase):
+    """다운로드 중인 .part 파일을 받은 곳까지만 순차로 읽는 스트림 (없으면 대기)"""
+
+    def __init__(self, downloader: SegmentedDownloader):
+        self._downloader = downloader
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        available = self._downloader.wait_for(self._pos + 1)
+        count = min(len(buffer), available - self._pos)
+        if count <= 0:
+            return 0
+        data = os.pread(self._downloader._fd, count, self._pos)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
@@ -0,0 +1,110 @@
+"""
+그래프 스냅샷 내보내기
+API 워커들이 메모리 매핑(mmap)으로 공유할 수 있도록 RELATED 그래프를
+CSR 인접 배열(.npy)과 노드 문자열 테이블(UTF-8 blob + offset)로 저장합니다.
+
+디렉토리 구조:
+    <out_dir>/snap-<timestamp>/   실제 파일
+    <out_dir>/current -> snap-... 원자적으로 교체되는 심볼릭 링크
+"""
+import os
+import json
+import time
+import shutil
+
+import numpy as np
+from tqdm import tqdm
+
+KEEP_SNAPSHOTS = 2  # 이전 스냅샷을 열고 있는 워커를 위해 남겨둘 개수
+
+def _write_strings(path_prefix, values):
+    """문자열 리스트 → <prefix>.bin (UTF-8 연결) + <prefix>.off.npy (int64 offset, n+1개)"""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    with open(path_prefix + ".bin", "wb") as f:
+        for b in encoded:
+            f.write(b)
+    np.save(path_prefix + ".off.npy", offsets)
+
+def export_snapshot(graph, out_dir):
+    """Neo4j 그래프를 CSR 스냅샷으로 내보내고 current 링크를 교체"""
+    print("🗜️ Exporting graph snapshot for API workers...")
+    os.makedirs(out_dir, exist_ok=True)
+    snap_name = f"snap-{time.time_ns()}"
+    snap_dir = os.path.join(out_dir, snap_name)
+    os.makedirs(snap_dir)
+
+    # 1. 노드 (uri 코드포인트 정렬 순서 = 노드 인덱스 → API에서 이진 탐색 가능)
+    rows = [
+        (rec["uri"], rec["id"], rec["label"] or "", rec["lang"] or "")
+        for rec in tqdm(graph.run("""
+            MATCH (c:Concept)
+            RETURN id(c) as id, c.uri as uri, c.label as label, c.language as lang
+            """), desc="Snapshot nodes")
+    ]
+    rows.sort()
+    uris = [r[0] for r in rows]
+    labels = [r[2] for r in rows]
+    langs = [r[3] for r in rows]
+    node_ids = {r[1]: i for i, r in enumerate(rows)}
+    del rows
+
+    # 2. 엣지
+    src, dst, weight, rel_code = [], [], [], []
+    rel_types = {}
+    cursor = graph.run("""
+        MATCH (s:Concept)-[r:RELATED]->(e:Concept)
+        RETURN id(s) as s, id(e) as e, r.weight as w, r.type as t
+        """)
+    for rec in tqdm(cursor, desc="Snapshot edges"):
+        src.append(node_ids[rec["s"]])
+        dst.append(node_ids[rec["e"]])
+        weight.append(rec["w"] if rec["w"] is not None else 1.0)
+        rel_code.append(rel_types.setdefault(rec["t"], len(rel_types)))
+
+    n, m = len(uris), len(src)
+    src = np.asarray(src, dtype=np.int32)
+    dst = np.asarray(dst, dtype=np.int32)
+
+    # 3. 무방향 CSR: 각 엣지를 양방향으로 넣고, 원래 엣지 번호와 방향(1=정방향)을 함께 저장
+    heads = np.concatenate([src, dst])
+    order = np.argsort(heads, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(heads, minlength=n), out=indptr[1:])
+    edge_ids = np.concatenate([np.arange(m), np.arange(m)]).astype(np.int32)
+
+    np.save(os.path.join(snap_dir, "indptr.npy"), indptr)
+    np.save(os.path.join(snap_dir, "neighbors.npy"), np.concatenate([dst, src])[order])
+    np.save(os.path.join(snap_dir, "edge_ids.npy"), edge_ids[order])
+    np.save(os.path.join(snap_dir, "forward.npy"), np.concatenate([np.ones(m, bool), np.zeros(m, bool)])[order])
+    np.save(os.path.join(snap_dir, "weights.npy"), np.asarray(weight, dtype=np.float32))
+    np.save(os.path.join(snap_dir, "rel_codes.npy"), np.asarray(rel_code, dtype=np.int16))
+
+    lang_codes = {}
+    np.save(os.path.join(snap_dir, "lang_codes.npy"),
+            np.asarray([lang_codes.setdefault(l, len(lang_codes)) for l in langs], dtype=np.int16))
+    _write_strings(os.path.join(snap_dir, "uris"), uris)
+    _write_strings(os.path.join(snap_dir, "labels"), labels)
+
+    with open(os.path.join(snap_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "nodes": n,
+            "edges": m,
+            "rel_types": list(rel_types),
+            "langs": list(lang_codes),
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        }, f, ensure_ascii=False)
+
+    # 4. current 링크 원자적 교체 후 오래된 스냅샷 정리
+    tmp_link = os.path.join(out_dir, "current.tmp")
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(snap_name, tmp_link)
+    os.replace(tmp_link, os.path.join(out_dir, "current"))
+
+    snaps = sorted(d for d in os.listdir(out_dir) if d.startswith("snap-"))
+    for old in snaps[:-KEEP_SNAPSHOTS]:
+        shutil.rmtree(os.path.join(out_dir, old), ignore_errors=True)
+
+    print(f"✅ Graph snapshot exported: {n} nodes, {m} edges -> {snap_dir}")